@@ -1,18 +1,31 @@
+from __future__ import annotations
+
 import os
-import requests
+import asyncio
+import base64
+import functools
 import traceback
 import logging
+import time
+import threading
+import wave
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from io import BytesIO
-from typing import Optional, List, Dict, Tuple, Any
-import openai
-from PIL import Image, ImageDraw, ImageFont
+from typing import Optional, List, Dict, Tuple, Any, Iterator, Callable, Union, NamedTuple, TYPE_CHECKING
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
-from tavily import TavilyClient
-import openai
-import streamlit as st
 from prompts import *
+from research_cache import ResearchCache
+from image_store import ImageStore
+from text_layout import wrap_text, line_height
+from context_compaction import compact_research_context, relevance_terms
+from near_dedup import dedupe_near_duplicates
+from text_normalize import normalize_text, compact_text
+
+if TYPE_CHECKING:
+    import requests
+    from PIL import Image, ImageDraw, ImageFont
 
 # --- Setup & Initialization ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -21,35 +34,183 @@ load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 
-try:
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7, api_key=OPENAI_API_KEY)
-    json_llm = llm.bind(response_format={"type": "json_object"})
-    tavily_client = TavilyClient(api_key=TAVILY_API_KEY)
-
-    # Parser Instances
-    str_parser = StrOutputParser()
-    json_parser_branding = JsonOutputParser(pydantic_object=BrandingOutput)
-    json_parser_info = JsonOutputParser(pydantic_object=ExtractedInfo)
-    json_parser_core_keyword = JsonOutputParser(pydantic_object=CoreProductKeyword)
-    json_parser_slogans = JsonOutputParser(pydantic_object=SloganAlternatives)
-except Exception as e:
-    logging.error(f"API 클라이언트 초기화 실패: {e}")
-    llm = None
-    tavily_client = None
-
-def extract_core_product_keyword(product_name: str) -> Optional[str]:
-    """상품명에서 핵심 키워드를 추출합니다."""
+# 무거운 라이브러리(langchain_openai, tavily, openai, PIL)는 실제로 쓰는 함수 안에서 import하고,
+# API 클라이언트와 파서는 처음 사용할 때 한 번만 생성합니다. (import 시간: benchmarks/bench_import_time.py)
+
+# LLM 응답 캐시 설정 (같은 프롬프트와 모델 설정이면 저장된 응답을 재사용)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(os.path.dirname(__file__), ".cache", "llm_cache.sqlite3"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
+
+@lru_cache(maxsize=None)
+def get_llm_cache():
+    """LLM 응답 캐시(LLMCache)를 반환합니다. 비활성화되었거나 열 수 없으면 None을 반환합니다."""
+    if not LLM_CACHE_ENABLED:
+        return None
+    try:
+        from llm_cache import LLMCache
+        return LLMCache(LLM_CACHE_PATH, ttl_seconds=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES)
+    except Exception as e:
+        logging.warning(f"LLM 캐시를 열 수 없어 캐시 없이 진행합니다: {e}")
+        return None
+
+def _llm_cache_scope(use_cache: bool):
+    """`use_cache=False`이면 블록 안의 LLM 호출이 캐시를 조회하지 않도록 합니다. ("다시 생성" 동작용)"""
+    from llm_cache import bypass_cache
+    return bypass_cache(active=not use_cache)
+
+def _create_chat_llm(cache=None):
+    try:
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(model="gpt-4o-mini", temperature=0.7, api_key=OPENAI_API_KEY, cache=cache)
+    except Exception as e:
+        logging.error(f"API 클라이언트 초기화 실패: {e}")
+        return None
+
+@lru_cache(maxsize=None)
+def get_llm():
+    """ChatOpenAI 클라이언트를 반환합니다. (LLM 캐시 없음) 초기화에 실패하면 None을 반환합니다."""
+    return _create_chat_llm()
+
+@lru_cache(maxsize=None)
+def get_cached_llm():
+    """LLM 응답 캐시(get_llm_cache)가 연결된 ChatOpenAI 클라이언트를 반환합니다.
+
+    같은 입력에 같은 결과를 돌려줘도 되는 호출(_CACHED_SCHEMAS)에만 사용합니다.
+    캐시가 비활성화되었으면 get_llm()과 같은 클라이언트를 반환합니다.
+    """
+    cache = get_llm_cache()
+    return _create_chat_llm(cache) if cache else get_llm()
+
+@lru_cache(maxsize=None)
+def get_json_llm():
+    """JSON 응답 형식이 지정된 LLM을 반환합니다. LLM 초기화에 실패했으면 None을 반환합니다."""
+    llm = get_llm()
+    return llm.bind(response_format={"type": "json_object"}) if llm else None
+
+@lru_cache(maxsize=None)
+def get_tavily_client():
+    """Tavily 클라이언트를 반환합니다. 초기화에 실패하면 None을 반환합니다."""
+    try:
+        from tavily import TavilyClient
+        return TavilyClient(api_key=TAVILY_API_KEY)
+    except Exception as e:
+        logging.error(f"API 클라이언트 초기화 실패: {e}")
+        return None
+
+@lru_cache(maxsize=None)
+def get_openai_client():
+    """DALL-E, Whisper 호출에 사용하는 OpenAI 클라이언트를 반환합니다."""
+    import openai
+    return openai.OpenAI(api_key=OPENAI_API_KEY)
+
+@lru_cache(maxsize=None)
+def get_str_parser():
+    from langchain_core.output_parsers import StrOutputParser
+    return StrOutputParser()
+
+@lru_cache(maxsize=None)
+def get_json_parser(pydantic_object=None):
+    """Pydantic 스키마별 JsonOutputParser를 반환합니다. (스키마마다 한 번만 생성)"""
+    from langchain_core.output_parsers import JsonOutputParser
+    return JsonOutputParser(pydantic_object=pydantic_object)
+
+# Pydantic 스키마별로 사용하는 프롬프트 이름 (prompts.get_prompt, get_structured_chain 참고)
+_STRUCTURED_PROMPTS = {
+    BrandingOutput: "BRANDING_PROMPT",
+    ExtractedInfo: "EXTRACT_INFO_PROMPT",
+    PageTextContent: "GENERATE_PAGE_TEXTS_PROMPT",
+    InstagramPost: "INSTAGRAM_POST_PROMPT",
+    NaverBlogPost: "NAVER_BLOG_PROMPT",
+    CoreProductKeyword: "EXTRACT_CORE_KEYWORD_PROMPT",
+    SloganAlternatives: "REGENERATE_SLOGAN_PROMPT",
+}
+# LLM 캐시를 사용하는 스키마 (use_cache 인자로 "다시 생성" 시 캐시를 건너뛸 수 있는 함수들만)
+# 상세페이지 텍스트, 브랜딩 등은 다시 실행할 때마다 새 결과가 나와야 하므로 캐시하지 않음
+_CACHED_SCHEMAS = {CoreProductKeyword, SloganAlternatives, InstagramPost, NaverBlogPost}
+
+@lru_cache(maxsize=None)
+def get_structured_chain(pydantic_object):
+    """스키마별로 미리 만들어 둔 `prompt | llm | parser` 체인을 반환합니다. LLM 초기화에 실패했으면 None을 반환합니다.
+
+    format_instructions는 체인을 만들 때 `PromptTemplate.partial`로 한 번만 채워두므로,
+    호출할 때마다 스키마 JSON을 다시 렌더링하지 않습니다. _CACHED_SCHEMAS의 체인만 LLM 캐시를 사용합니다.
+    """
+    llm = get_cached_llm() if pydantic_object in _CACHED_SCHEMAS else get_llm()
     if not llm:
+        return None
+    parser = get_json_parser(pydantic_object)
+    prompt = get_prompt(_STRUCTURED_PROMPTS[pydantic_object]).partial(format_instructions=parser.get_format_instructions())
+    return prompt | llm | parser
+
+# 기존 코드에서 쓰던 모듈 속성 이름(api.llm, api.tavily_client 등)을 접근자로 연결
+_LAZY_ATTRIBUTES = {
+    "llm": get_llm,
+    "json_llm": get_json_llm,
+    "tavily_client": get_tavily_client,
+    "str_parser": get_str_parser,
+    "json_parser_branding": lambda: get_json_parser(BrandingOutput),
+    "json_parser_info": lambda: get_json_parser(ExtractedInfo),
+    "json_parser_core_keyword": lambda: get_json_parser(CoreProductKeyword),
+    "json_parser_slogans": lambda: get_json_parser(SloganAlternatives),
+}
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    if name == "http_session":
+        return get_http_session()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# --- 진행 상황 알림 ---
+# 생성 함수들은 Streamlit에 직접 메시지를 출력하지 않고, (level, message)를 받는 콜백으로 진행 상황을 알립니다.
+# level은 "info", "success", "warning", "error" 중 하나입니다.
+ProgressCallback = Callable[[str, str], None]
+
+def log_progress(level: str, message: str) -> None:
+    """기본 진행 상황 콜백으로, 메시지를 로그로만 남깁니다. (배치 작업, 백그라운드 워커용)"""
+    log_level = {"error": logging.ERROR, "warning": logging.WARNING}.get(level, logging.INFO)
+    logging.log(log_level, message)
+
+class ProgressEventQueue:
+    """여러 스레드에서 발생한 진행 상황 이벤트를 모아두는 콜백
+
+    워커 스레드에서는 UI를 직접 갱신할 수 없으므로, 이벤트를 큐에 쌓아두었다가
+    호출한 쪽(예: Streamlit 메인 스레드)에서 `drain()`으로 꺼내 표시합니다.
+    """
+    def __init__(self, forward: Optional[ProgressCallback] = log_progress):
+        self._queue: "queue.SimpleQueue[Tuple[str, str]]" = queue.SimpleQueue()
+        self._forward = forward
+
+    def __call__(self, level: str, message: str) -> None:
+        self._queue.put((level, message))
+        if self._forward:
+            self._forward(level, message)
+
+    def drain(self) -> Iterator[Tuple[str, str]]:
+        """지금까지 쌓인 이벤트를 발생 순서대로 꺼냅니다."""
+        while True:
+            try:
+                yield self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+def extract_core_product_keyword(product_name: str, use_cache: bool = True) -> Optional[str]:
+    """상품명에서 핵심 키워드를 추출합니다. `use_cache=False`이면 LLM 캐시를 건너뜁니다.
+
+    띄어쓰기/문장부호만 다른 상품명('영천 사과', '영천사과')이 같은 캐시 항목을 쓰도록,
+    프롬프트에는 공백과 문장부호를 지운 상품명(compact_text)을 넣습니다.
+    """
+    chain = get_structured_chain(CoreProductKeyword)
+    if not chain:
         logging.error("LLM이 초기화되지 않아 핵심 단어 추출을 건너뜁니다.")
         return product_name # 실패 시 원본 상품명 반환
     
-    chain = EXTRACT_CORE_KEYWORD_PROMPT | llm | json_parser_core_keyword
     try:
         logging.info(f"'{product_name}'에서 핵심 단어 추출 시도...")
-        result = chain.invoke({
-            "product_name": product_name,
-            "format_instructions": json_parser_core_keyword.get_format_instructions()
-        })
+        with _llm_cache_scope(use_cache):
+            result = chain.invoke({"product_name": compact_text(product_name) or product_name})
         core_keyword = result.get('core_keyword', product_name)
         logging.info(f"핵심 단어 추출 성공: {core_keyword}")
         return core_keyword
@@ -57,57 +218,247 @@ def extract_core_product_keyword(product_name: str) -> Optional[str]:
         logging.error(f"핵심 단어 추출 중 오류 발생: {e}")
         return product_name # 오류 발생 시에도 원본 상품명 반환
 
-def regenerate_slogan(core_concept: str, original_slogan: str) -> Optional[List[str]]:
-    """핵심 컨셉을 바탕으로 새로운 슬로건들을 제안합니다."""
+def regenerate_slogan(core_concept: str, original_slogan: str, use_cache: bool = True) -> Optional[List[str]]:
+    """핵심 컨셉을 바탕으로 새로운 슬로건들을 제안합니다. `use_cache=False`이면 LLM 캐시를 건너뜁니다."""
     logging.info("새로운 슬로건 생성을 시작합니다.")
     
-    chain = REGENERATE_SLOGAN_PROMPT | llm | json_parser_slogans
+    chain = get_structured_chain(SloganAlternatives)
     try:
-        response = chain.invoke({
-            "core_concept": core_concept,
-            "original_slogan": original_slogan,
-            "format_instructions": json_parser_slogans.get_format_instructions()
-        })
+        with _llm_cache_scope(use_cache):
+            response = chain.invoke({
+                "core_concept": core_concept,
+                "original_slogan": original_slogan,
+            })
         return response.get('alternatives', [])
     except Exception as e:
         logging.error(f"슬로건 재생성 중 오류: {e}\n{traceback.format_exc()}")
         return None
     
 # --- 음성 인식 및 AI 인터뷰 관련 함수 ---
+# 긴 음성 분할 전사 설정
+TRANSCRIBE_CHUNK_SECONDS = float(os.getenv("TRANSCRIBE_CHUNK_SECONDS", "30"))
+TRANSCRIBE_SILENCE_SEARCH_SECONDS = float(os.getenv("TRANSCRIBE_SILENCE_SEARCH_SECONDS", "3"))
+TRANSCRIBE_MAX_WORKERS = int(os.getenv("TRANSCRIBE_MAX_WORKERS", "4"))
+
+# Whisper 업로드용 오디오 인코딩 설정
+AUDIO_UPLOAD_SAMPLE_RATE = 16000
+AUDIO_UPLOAD_CODEC = os.getenv("AUDIO_UPLOAD_CODEC", "flac")
+
+# 코덱별 (컨테이너 형식, PyAV 코덱 이름, 파일 확장자)
+_AUDIO_UPLOAD_FORMATS = {
+    "wav": ("wav", "pcm_s16le", "wav"),
+    "flac": ("flac", "flac", "flac"),
+    "opus": ("ogg", "libopus", "ogg"),
+}
+
+def encode_audio_for_upload(audio_bytes: bytes, codec: str = AUDIO_UPLOAD_CODEC,
+                            sample_rate: int = AUDIO_UPLOAD_SAMPLE_RATE) -> Tuple[bytes, str, Dict[str, Any]]:
+    """Whisper 업로드 전에 음성을 16kHz mono로 다운샘플링하고, 지정한 코덱(wav/flac/opus)으로 인코딩합니다.
+
+    반환값은 (인코딩된 데이터, 업로드용 파일명, 크기/소요 시간 리포트)입니다.
+    """
+    import av
+
+    container_format, codec_name, extension = _AUDIO_UPLOAD_FORMATS[codec]
+    start = time.perf_counter()
+    output = BytesIO()
+    with av.open(BytesIO(audio_bytes), mode="r") as input_container, \
+            av.open(output, mode="w", format=container_format) as output_container:
+        stream = output_container.add_stream(codec_name, rate=sample_rate, layout="mono")
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=sample_rate)
+
+        def _encode(frames):
+            for frame in frames:
+                frame.pts = None
+                for packet in stream.encode(frame):
+                    output_container.mux(packet)
+
+        for frame in input_container.decode(audio=0):
+            _encode(resampler.resample(frame))
+        _encode(resampler.resample(None))
+        for packet in stream.encode(None):
+            output_container.mux(packet)
+
+    encoded = output.getvalue()
+    report = {
+        "codec": codec,
+        "original_bytes": len(audio_bytes),
+        "encoded_bytes": len(encoded),
+        "ratio": len(encoded) / len(audio_bytes) if audio_bytes else 0.0,
+        "encode_ms": (time.perf_counter() - start) * 1000,
+    }
+    logging.info(f"음성 인코딩({codec}): {report['original_bytes'] / 1024:.1f}KB -> "
+                 f"{report['encoded_bytes'] / 1024:.1f}KB ({report['ratio']:.0%}), {report['encode_ms']:.0f}ms")
+    return encoded, f"temp_audio.{extension}", report
+
+def _whisper_transcribe(audio_bytes: bytes, codec: str = AUDIO_UPLOAD_CODEC) -> str:
+    """음성을 업로드용으로 인코딩한 뒤 Whisper API로 텍스트로 변환합니다. 오류는 호출한 쪽에서 처리합니다."""
+    try:
+        upload_bytes, filename, _ = encode_audio_for_upload(audio_bytes, codec)
+    except Exception as e:
+        logging.warning(f"음성 인코딩 실패, 원본 WAV를 그대로 업로드합니다: {e}")
+        upload_bytes, filename = audio_bytes, "temp_audio.wav"
+
+    # Whisper API는 파일 객체를 요구하므로, BytesIO를 사용합니다.
+    audio_file = BytesIO(upload_bytes)
+    audio_file.name = filename
+
+    start = time.perf_counter()
+    transcript = get_openai_client().audio.transcriptions.create(
+        model="whisper-1",
+        file=audio_file,
+        response_format="text"
+    )
+    logging.info(f"Whisper 업로드 및 전사 완료: {len(upload_bytes) / 1024:.1f}KB, {(time.perf_counter() - start) * 1000:.0f}ms")
+    return transcript
+
 def transcribe_audio(audio_bytes: bytes) -> Optional[str]:
     """OpenAI Whisper API를 사용하여 음성 파일을 텍스트로 변환합니다."""
     if not OPENAI_API_KEY:
         logging.error("OpenAI API 키가 설정되지 않아 음성 인식을 건너뜁니다.")
         return None
     try:
-        # Whisper API는 파일 객체를 요구하므로, BytesIO를 사용합니다.
-        audio_file = BytesIO(audio_bytes)
-        audio_file.name = "temp_audio.wav"  # 임의의 파일명 지정
-
-        transcript = openai.audio.transcriptions.create(
-            model="whisper-1",
-            file=audio_file,
-            response_format="text"
-        )
+        transcript = _whisper_transcribe(audio_bytes)
         logging.info(f"음성 인식 성공: {transcript}")
         return transcript
     except Exception as e:
         logging.error(f"Whisper API 호출 중 오류 발생: {e}")
         return "음성 인식 중 오류가 발생했습니다. 다시 시도해주세요."
 
+def _pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    buffer = BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm)
+    return buffer.getvalue()
+
+def split_wav_on_silence(wav_bytes: bytes, chunk_seconds: float = TRANSCRIBE_CHUNK_SECONDS,
+                         search_seconds: float = TRANSCRIBE_SILENCE_SEARCH_SECONDS) -> List[bytes]:
+    """16비트 mono WAV를 약 `chunk_seconds` 길이의 WAV 구간들로 나눕니다.
+
+    각 경계는 목표 지점 앞뒤 `search_seconds` 안에서 가장 조용한 20ms 구간으로 옮겨, 단어 중간에서 잘리지 않게 합니다.
+    지원하지 않는 형식이거나 충분히 짧으면 원본 하나만 담아 반환합니다.
+    """
+    import numpy as np
+
+    with wave.open(BytesIO(wav_bytes), "rb") as wav_file:
+        if wav_file.getnchannels() != 1 or wav_file.getsampwidth() != 2:
+            return [wav_bytes]
+        sample_rate = wav_file.getframerate()
+        samples = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype=np.int16)
+
+    chunk = int(sample_rate * chunk_seconds)
+    search = min(int(sample_rate * search_seconds), chunk // 2)
+    window = max(1, int(sample_rate * 0.02))
+    if len(samples) <= chunk + search:
+        return [wav_bytes]
+
+    boundaries = [0]
+    while len(samples) - boundaries[-1] > chunk + search:
+        target = boundaries[-1] + chunk
+        lo, hi = target - search, target + search
+        n_windows = (hi - lo) // window
+        segment = samples[lo:lo + n_windows * window].astype(np.float32).reshape(n_windows, window)
+        quietest = int(np.argmin((segment ** 2).mean(axis=1)))
+        boundaries.append(lo + quietest * window + window // 2)
+    boundaries.append(len(samples))
+
+    return [_pcm_to_wav(samples[start:end].tobytes(), sample_rate) for start, end in zip(boundaries, boundaries[1:])]
+
+class StubTranscriber:
+    """네트워크 없이 쓸 수 있는 로컬 전사기 (테스트/개발용)
+
+    Whisper 대신 각 구간의 길이를 담은 고정 문구를 돌려주며, `delay`로 API 지연을 흉내낼 수 있습니다.
+    """
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    def __call__(self, audio_bytes: bytes) -> str:
+        with wave.open(BytesIO(audio_bytes), "rb") as wav_file:
+            duration = wav_file.getnframes() / wav_file.getframerate()
+        if self.delay:
+            time.sleep(self.delay)
+        return f"[{duration:.1f}초 음성]"
+
+class TranscriptionProgress(NamedTuple):
+    """transcribe_audio_chunked가 구간마다 yield하는 진행 상황"""
+    text: str    # 지금까지 이어붙인 전사 결과
+    done: int    # 처리한 구간 수
+    failed: int  # 전사에 실패한 구간 수
+    total: int   # 전체 구간 수
+
+    @property
+    def all_failed(self) -> bool:
+        return self.total == 0 or self.failed == self.total
+
+def transcribe_audio_chunked(audio_bytes: bytes, chunk_seconds: float = TRANSCRIBE_CHUNK_SECONDS,
+                             max_workers: int = TRANSCRIBE_MAX_WORKERS,
+                             transcriber: Optional[Callable[[bytes], str]] = None) -> Iterator[TranscriptionProgress]:
+    """긴 음성을 조용한 지점 기준으로 나누어 동시에 전사하고, 구간마다 진행 상황(TranscriptionProgress)을 yield합니다.
+
+    구간들은 최대 `max_workers`개가 동시에 전사되지만, 결과는 항상 앞 구간부터 순서대로 이어붙습니다.
+    실패한 구간은 건너뛰고 `failed`에 집계하며, 마지막으로 yield된 값의 `text`가 전체 전사 결과입니다.
+    API 키가 없으면 전체 구간이 실패한 것으로 한 번 yield합니다.
+    `transcriber`를 지정하면 Whisper 대신 사용합니다 (예: StubTranscriber).
+    """
+    if transcriber is None:
+        if not OPENAI_API_KEY:
+            logging.error("OpenAI API 키가 설정되지 않아 음성 인식을 건너뜁니다.")
+            yield TranscriptionProgress("", 0, 0, 0)
+            return
+        transcriber = _whisper_transcribe
+
+    try:
+        chunks = split_wav_on_silence(audio_bytes, chunk_seconds)
+    except Exception as e:
+        logging.warning(f"음성 분할 실패, 전체를 한 번에 전사합니다: {e}")
+        chunks = [audio_bytes]
+    logging.info(f"음성을 {len(chunks)}개 구간으로 나누어 전사합니다.")
+
+    texts, failed = [], 0
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="whisper") as executor:
+        futures = [executor.submit(transcriber, chunk) for chunk in chunks]
+        for i, future in enumerate(futures):
+            try:
+                text = (future.result() or "").strip()
+            except Exception as e:
+                logging.error(f"음성 구간 {i + 1}/{len(chunks)} 전사 중 오류 발생: {e}")
+                text = ""
+                failed += 1
+            if text:
+                texts.append(text)
+            yield TranscriptionProgress(" ".join(texts), i + 1, failed, len(chunks))
+
 
 def generate_story_from_interview(interview_summary: str) -> Optional[str]:
     """AI 인터뷰 요약본을 바탕으로 최종 상품 스토리를 생성합니다."""
+    llm = get_llm()
     if not llm:
         logging.error("LLM이 초기화되지 않아 스토리 생성을 건너뜁니다.")
         return None
     try:
-        chain = STORY_GENERATION_FROM_INTERVIEW_PROMPT | llm | str_parser
+        chain = get_prompt("STORY_GENERATION_FROM_INTERVIEW_PROMPT") | llm | get_str_parser()
         generated_story = chain.invoke({"interview_summary": interview_summary})
         return generated_story
     except Exception as e:
         logging.error(f"인터뷰 기반 스토리 생성 중 오류: {e}")
         return "스토리 생성 중 오류가 발생했습니다."
+
+def stream_story_from_interview(interview_summary: str) -> Iterator[str]:
+    """generate_story_from_interview의 스트리밍 버전으로, 생성되는 스토리 텍스트를 토큰 단위로 yield합니다."""
+    llm = get_llm()
+    if not llm:
+        logging.error("LLM이 초기화되지 않아 스토리 생성을 건너뜁니다.")
+        return
+    try:
+        chain = get_prompt("STORY_GENERATION_FROM_INTERVIEW_PROMPT") | llm | get_str_parser()
+        for chunk in chain.stream({"interview_summary": interview_summary}):
+            yield chunk
+    except Exception as e:
+        logging.error(f"인터뷰 기반 스토리 스트리밍 중 오류: {e}")
+        yield "스토리 생성 중 오류가 발생했습니다."
     
 FONT_FOLDER = "fonts"
 FONT_FILENAME = "나눔손글씨_성실체.ttf"
@@ -115,135 +466,660 @@ FONT_FILENAME = "나눔손글씨_성실체.ttf"
 FONT_PATH = os.path.join(os.path.dirname(__file__), FONT_FOLDER, FONT_FILENAME)
 NUM_DETAIL_PAGES = 5
 
+# Tavily 검색 동시 실행 설정
+TAVILY_MAX_WORKERS = int(os.getenv("TAVILY_MAX_WORKERS", "5"))
+TAVILY_QUERY_TIMEOUT = float(os.getenv("TAVILY_QUERY_TIMEOUT", "15"))
+# 프롬프트에 넣을 웹 검색 결과(live_local_info)의 최대 토큰 수 (0이면 제한 없음)
+RESEARCH_CONTEXT_TOKEN_BUDGET = int(os.getenv("RESEARCH_CONTEXT_TOKEN_BUDGET", "1500"))
+
+# DALL-E 동시 생성 수 및 rate limit 재시도 설정
+DALLE_MAX_WORKERS = int(os.getenv("DALLE_MAX_WORKERS", "3"))
+DALLE_RATE_LIMIT_RETRIES = int(os.getenv("DALLE_RATE_LIMIT_RETRIES", "3"))
+DALLE_RATE_LIMIT_BACKOFF = float(os.getenv("DALLE_RATE_LIMIT_BACKOFF", "5"))
+
+# 이미지 다운로드용 공유 HTTP 세션 설정
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+
+@lru_cache(maxsize=None)
+def get_http_session() -> requests.Session:
+    """keep-alive 연결을 재사용하고, 일시적인 오류는 백오프로 재시도하는 공유 HTTP 세션을 반환합니다."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=HTTP_MAX_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+    )
+    # pool_block=True: 연결 수가 HTTP_POOL_MAXSIZE를 넘지 않도록 초과 요청은 대기시킴
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_MAXSIZE, pool_block=True, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def _http_get(url: str) -> bytes:
+    """공유 HTTP 세션으로 URL의 내용을 내려받고, 전송 크기와 소요 시간을 기록합니다."""
+    start = time.perf_counter()
+    response = get_http_session().get(url, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+    response.raise_for_status()
+    content = response.content
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logging.info(f"다운로드 완료: {len(content) / 1024:.1f}KB, {elapsed_ms:.0f}ms ({url[:60]}...)")
+    return content
+
+# --- Async I/O 루프 및 클라이언트 ---
+# 모든 비동기 네트워크 호출(LLM, DALL-E, Tavily)은 하나의 공유 I/O 이벤트 루프에서 실행됩니다.
+# 클라이언트의 연결 풀이 한 루프에만 묶이므로, 호출한 쪽이 어떤 루프(또는 동기 코드)에 있든 안전하게 재사용됩니다.
+_io_loop: Optional[asyncio.AbstractEventLoop] = None
+_io_loop_lock = threading.Lock()
+
+def _get_io_loop() -> asyncio.AbstractEventLoop:
+    """공유 I/O 이벤트 루프를 반환합니다. 처음 호출될 때 데몬 스레드에서 루프를 시작합니다."""
+    global _io_loop
+    with _io_loop_lock:
+        if _io_loop is None:
+            _io_loop = asyncio.new_event_loop()
+            threading.Thread(target=_io_loop.run_forever, name="api-io-loop", daemon=True).start()
+        return _io_loop
+
+def _on_io_loop(func):
+    """async 함수가 항상 공유 I/O 루프에서 실행되도록 감싸는 데코레이터"""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        loop = _get_io_loop()
+        coro = func(*args, **kwargs)
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+    return wrapper
+
+def _run_sync(coro):
+    """동기 함수에서 코루틴을 공유 I/O 루프에 실행하고 결과를 기다립니다."""
+    loop = _get_io_loop()
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if running_loop is loop:
+        coro.close()
+        raise RuntimeError("I/O 루프 안에서는 동기 함수를 호출할 수 없습니다. async 버전(a*)을 사용하세요.")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+# 결과를 기다리지 않는 I/O 루프 작업 (끝나기 전에 가비지 컬렉션되지 않도록 참조를 보관)
+_background_tasks: "set[asyncio.Task]" = set()
+
+def _spawn_background(coro, label: str) -> None:
+    """공유 I/O 루프 안에서 `coro`를 백그라운드 작업으로 실행합니다. 실패는 로그로만 남깁니다."""
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+
+    def _done(finished: asyncio.Task) -> None:
+        _background_tasks.discard(finished)
+        if not finished.cancelled() and finished.exception() is not None:
+            logging.warning(f"{label} 실패: {finished.exception()}")
+    task.add_done_callback(_done)
+
+def wait_for_background_tasks(timeout: Optional[float] = None) -> None:
+    """진행 중인 백그라운드 작업(벡터 인덱스 추가 등)이 끝날 때까지 기다립니다. 종료 직전의 CLI에서 사용합니다."""
+    async def _wait():
+        if _background_tasks:
+            await asyncio.wait(list(_background_tasks), timeout=timeout)
+    _run_sync(_wait())
+
+@lru_cache(maxsize=None)
+def get_async_openai_client():
+    """DALL-E 호출에 사용하는 AsyncOpenAI 클라이언트를 반환합니다."""
+    import openai
+    return openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
+
+@lru_cache(maxsize=None)
+def get_async_tavily_client():
+    """AsyncTavilyClient를 반환합니다. 초기화에 실패하면 None을 반환합니다."""
+    try:
+        from tavily import AsyncTavilyClient
+        return AsyncTavilyClient(api_key=TAVILY_API_KEY)
+    except Exception as e:
+        logging.error(f"API 클라이언트 초기화 실패: {e}")
+        return None
+
+# 생성 이미지 로컬 저장소 설정
+IMAGE_STORE_ENABLED = os.getenv("IMAGE_STORE_ENABLED", "1") == "1"
+IMAGE_STORE_DIR = os.getenv("IMAGE_STORE_DIR", os.path.join(os.path.dirname(__file__), ".cache", "images"))
+IMAGE_STORE_MAX_BYTES = int(os.getenv("IMAGE_STORE_MAX_BYTES", str(500 * 1024 * 1024)))
+
+_image_store: Optional[ImageStore] = None
+_image_store_lock = threading.Lock()
+
+def get_image_store() -> Optional[ImageStore]:
+    """생성 이미지 저장소 인스턴스를 반환합니다. 비활성화되었거나 열 수 없으면 None을 반환합니다."""
+    global _image_store, IMAGE_STORE_ENABLED
+    if not IMAGE_STORE_ENABLED:
+        return None
+    with _image_store_lock:
+        if _image_store is None:
+            try:
+                _image_store = ImageStore(IMAGE_STORE_DIR, max_bytes=IMAGE_STORE_MAX_BYTES)
+            except Exception as e:
+                logging.warning(f"이미지 저장소를 열 수 없어 저장 없이 진행합니다: {e}")
+                IMAGE_STORE_ENABLED = False
+        return _image_store
+
+# 상세페이지 섹션 텍스트 동시 생성 수
+SECTION_TEXT_MAX_CONCURRENCY = int(os.getenv("SECTION_TEXT_MAX_CONCURRENCY", "5"))
+
+# Tavily 검색 결과 디스크 캐시 설정
+RESEARCH_CACHE_ENABLED = os.getenv("RESEARCH_CACHE_ENABLED", "1") == "1"
+RESEARCH_CACHE_PATH = os.getenv("RESEARCH_CACHE_PATH", os.path.join(os.path.dirname(__file__), ".cache", "research_cache.sqlite3"))
+RESEARCH_CACHE_TTL = float(os.getenv("RESEARCH_CACHE_TTL", str(7 * 24 * 3600)))
+RESEARCH_CACHE_MAX_ENTRIES = int(os.getenv("RESEARCH_CACHE_MAX_ENTRIES", "5000"))
+
+_research_cache: Optional[ResearchCache] = None
+_research_cache_lock = threading.Lock()
+
+def get_research_cache() -> Optional[ResearchCache]:
+    """리서치 캐시 인스턴스를 반환합니다. 비활성화되었거나 열 수 없으면 None을 반환합니다."""
+    global _research_cache, RESEARCH_CACHE_ENABLED
+    if not RESEARCH_CACHE_ENABLED:
+        return None
+    with _research_cache_lock:
+        if _research_cache is None:
+            try:
+                _research_cache = ResearchCache(RESEARCH_CACHE_PATH, ttl_seconds=RESEARCH_CACHE_TTL,
+                                                max_entries=RESEARCH_CACHE_MAX_ENTRIES)
+            except Exception as e:
+                logging.warning(f"리서치 캐시를 열 수 없어 캐시 없이 진행합니다: {e}")
+                RESEARCH_CACHE_ENABLED = False
+        return _research_cache
+
+# 과거 웹 검색 스니펫을 모아두는 로컬 벡터 인덱스 설정
+# RESEARCH_RETRIEVAL_MODE: "index_first"이면 인덱스에서 먼저 찾고 부족한 쿼리만 Tavily로 검색, "web"이면 항상 Tavily 사용
+# (유사도 임계값을 실제 데이터로 조정하기 전까지는 "web"이 기본값이며, 인덱스에는 계속 스니펫이 쌓임)
+VECTOR_INDEX_ENABLED = os.getenv("VECTOR_INDEX_ENABLED", "1") == "1"
+VECTOR_INDEX_DIR = os.getenv("VECTOR_INDEX_DIR", os.path.join(os.path.dirname(__file__), ".cache", "vector_index"))
+VECTOR_INDEX_EMBEDDER = os.getenv("VECTOR_INDEX_EMBEDDER", "openai")  # "openai" 또는 "hashing"(오프라인 테스트용)
+VECTOR_INDEX_MIN_SCORE = os.getenv("VECTOR_INDEX_MIN_SCORE")  # 지정하지 않으면 임베더별 기본값 사용
+VECTOR_INDEX_MIN_HITS = int(os.getenv("VECTOR_INDEX_MIN_HITS", "2"))
+RESEARCH_RETRIEVAL_MODE = os.getenv("RESEARCH_RETRIEVAL_MODE", "web")
+
+_vector_index = None
+_vector_index_lock = threading.Lock()
+
+def get_vector_index():
+    """로컬 벡터 인덱스(VectorIndex)를 반환합니다. 비활성화되었거나 열 수 없으면 None을 반환합니다."""
+    global _vector_index, VECTOR_INDEX_ENABLED
+    if not VECTOR_INDEX_ENABLED:
+        return None
+    with _vector_index_lock:
+        if _vector_index is None:
+            try:
+                from vector_index import VectorIndex, HashingEmbedder, OpenAIEmbedder
+                if VECTOR_INDEX_EMBEDDER == "openai" and OPENAI_API_KEY:
+                    embedder = OpenAIEmbedder(get_openai_client())
+                else:
+                    embedder = HashingEmbedder()
+                _vector_index = VectorIndex(VECTOR_INDEX_DIR, embedder)
+            except Exception as e:
+                logging.warning(f"벡터 인덱스를 열 수 없어 인덱스 없이 진행합니다: {e}")
+                VECTOR_INDEX_ENABLED = False
+        return _vector_index
+
+# 미리 수집해 둔 원산지/상품별 리서치 지식 베이스 (precompute_knowledge.py로 생성)
+KNOWLEDGE_BASE_ENABLED = os.getenv("KNOWLEDGE_BASE_ENABLED", "1") == "1"
+KNOWLEDGE_BASE_PATH = os.getenv("KNOWLEDGE_BASE_PATH", os.path.join(os.path.dirname(__file__), "data", "knowledge_base.json.gz"))
+
+_knowledge_base = None
+_knowledge_base_lock = threading.Lock()
+
+def get_knowledge_base():
+    """지식 베이스(KnowledgeBase)를 반환합니다. 비활성화되었거나 파일이 없으면 None을 반환합니다."""
+    global _knowledge_base, KNOWLEDGE_BASE_ENABLED
+    if not KNOWLEDGE_BASE_ENABLED:
+        return None
+    with _knowledge_base_lock:
+        if _knowledge_base is None:
+            if not os.path.exists(KNOWLEDGE_BASE_PATH):
+                KNOWLEDGE_BASE_ENABLED = False
+                return None
+            try:
+                from knowledge_base import KnowledgeBase
+                _knowledge_base = KnowledgeBase.load(KNOWLEDGE_BASE_PATH)
+                logging.info(f"지식 베이스를 불러왔습니다: {len(_knowledge_base)}개 항목 (revision {_knowledge_base.revision})")
+            except Exception as e:
+                logging.warning(f"지식 베이스를 읽을 수 없어 사용하지 않습니다: {e}")
+                KNOWLEDGE_BASE_ENABLED = False
+        return _knowledge_base
+
+async def _aadd_to_index(index, snippets: List[Dict]) -> None:
+    added = await asyncio.to_thread(index.add, snippets)
+    if added:
+        logging.info(f"벡터 인덱스에 스니펫 {added}개를 추가했습니다. (총 {len(index)}개)")
+
+def _mentions_subject(meta: Dict[str, Any], required_terms: List[str]) -> bool:
+    # 인덱스 항목의 원래 쿼리/제목/내용에 이번 쿼리의 원산지/상품 단어가 모두 들어 있는지 확인
+    text = normalize_text(f"{meta.get('query', '')} {meta.get('title', '')} {meta.get('content', '')}", lowercase=True)
+    return all(term in text for term in required_terms)
+
+async def _aretrieve_from_index(index, queries: List[str], product_info: dict) -> Dict[str, List[Dict]]:
+    """인덱스에서 쿼리별 스니펫을 찾고, 충분히 관련된 결과가 VECTOR_INDEX_MIN_HITS개 이상인 쿼리의 결과만 반환합니다.
+
+    코사인 유사도가 임계값 이상이어도, 쿼리에 들어 있는 원산지/상품 단어(relevance_terms)를 언급하지 않는 항목은
+    다른 작물이나 지역에 대한 스니펫일 수 있으므로 제외합니다. 유사도는 Tavily 점수(`score`)와 척도가 다르므로
+    `similarity`에 따로 담고, `score`에는 인덱스에 저장된 원래 Tavily 점수를 담습니다.
+    """
+    min_score = float(VECTOR_INDEX_MIN_SCORE) if VECTOR_INDEX_MIN_SCORE else index.embedder.default_min_score
+    try:
+        hits_per_query = await asyncio.to_thread(index.search, queries, 3)
+    except Exception as e:
+        logging.warning(f"벡터 인덱스 검색 중 오류 발생, 웹 검색으로 대체합니다: {e}")
+        return {}
+    terms = relevance_terms(product_info)
+    covered = {}
+    for query, hits in zip(queries, hits_per_query):
+        normalized_query = normalize_text(query, lowercase=True)
+        required_terms = [term for term in terms if term in normalized_query]
+        results = [{"title": meta.get("title", ""), "url": meta.get("url", ""), "content": meta["content"],
+                    "score": meta.get("score") or 0.0, "similarity": similarity}
+                   for similarity, meta in hits
+                   if similarity >= min_score and _mentions_subject(meta, required_terms)]
+        if len(results) >= VECTOR_INDEX_MIN_HITS:
+            covered[query] = results
+    return covered
+
 # --- Core Logic Functions ---
 
 def extract_info_from_user_input(user_input: str, chat_history_summary: str) -> Optional[Dict]:
     """LangChain 체인을 사용하여 사용자 입력에서 정보를 추출합니다."""
-    if not llm:
+    chain = get_structured_chain(ExtractedInfo)
+    if not chain:
         logging.error("LLM이 초기화되지 않아 정보 추출을 건너뜁니다.")
         return None
-    chain = EXTRACT_INFO_PROMPT | llm | json_parser_info
     try:
         return chain.invoke({
             "user_input": user_input,
             "chat_history_summary": chat_history_summary,
-            "format_instructions": json_parser_info.get_format_instructions()
         })
     except Exception as e:
         logging.error(f"정보 추출 중 오류 발생: {e}")
         return None
 
-def search_with_tavily_multi_query(product_info: dict) -> Tuple[str, List[str]]:
-    """Tavily를 사용하여 웹에서 심층 정보를 검색하고, 수행된 쿼리 목록과 요약 결과를 반환합니다."""
-    if not tavily_client:
-        logging.error("Tavily 클라이언트가 초기화되지 않아 검색을 건너뜁니다.")
-        return "Tavily 클라이언트가 설정되지 않았습니다.", []
+async def _asearch_single_query(query: str) -> List[Dict]:
+    """Tavily 단일 쿼리를 실행하고 결과 목록을 반환합니다. 캐시에 있으면 Tavily를 호출하지 않습니다."""
+    search_options = {"search_depth": "basic", "max_results": 3}
+    cache = get_research_cache()
+    cache_key = ResearchCache.make_key(query, **search_options) if cache else None
+    if cache:
+        cached = await asyncio.to_thread(cache.get, cache_key)
+        if cached is not None:
+            logging.info(f"'{query}' 검색 결과를 캐시에서 가져왔습니다.")
+            return cached.get('results', [])
 
-    region = product_info.get("원산지", "")
-    product = product_info.get("핵심상품명", product_info.get("상품명", ""))
-    
-    queries = [
+    response = await get_async_tavily_client().search(query=query, **search_options)
+    if cache:
+        await asyncio.to_thread(cache.set, cache_key, {"results": response.get('results', [])})
+    return response.get('results', [])
+
+def research_subject(product_info: dict) -> Tuple[str, str]:
+    """웹 리서치에 사용할 (원산지, 상품명)을 반환합니다. 핵심상품명이 있으면 상품명 대신 사용합니다."""
+    return product_info.get("원산지", ""), product_info.get("핵심상품명", product_info.get("상품명", ""))
+
+def build_research_queries(region: str, product: str) -> List[str]:
+    return [
         f"'{region} {product}'의 역사, 기후, 토양 특징",
         f"'{product}'의 주된 효능 및 영양성분",
         f"'{product}'을 활용한 특별한 레시피",
         f"'{product}' 신선도 유지 및 보관법",
         f"'{region}' 지역의 문화 또는 스토리",
     ]
-    
-    logging.info(f"다음 쿼리로 웹 탐색을 수행합니다: {queries}")
-    
-    final_summary = ""
+
+@_on_io_loop
+async def acollect_research_snippets(product_info: dict, max_concurrency: int = TAVILY_MAX_WORKERS,
+                                     query_timeout: float = TAVILY_QUERY_TIMEOUT,
+                                     retrieval_mode: Optional[str] = None) -> Tuple[Optional[List[Dict]], List[str]]:
+    """리서치 쿼리별 스니펫을 모아 (스니펫 목록, 쿼리 목록)을 반환합니다. (async)
+
+    `retrieval_mode`(기본값 RESEARCH_RETRIEVAL_MODE)가 "index_first"이면 로컬 벡터 인덱스에서 먼저 찾고,
+    인덱스에 충분한 결과가 없는 쿼리만 웹에서 검색합니다. 웹에서 가져온 스니펫은 모두 인덱스에 추가되며,
+    추가(임베딩 포함)는 백그라운드에서 진행되므로 반환을 늦추지 않습니다. (wait_for_background_tasks 참고)
+
+    쿼리들은 최대 `max_concurrency`개씩 동시에 실행되며, 각 쿼리는 실행을 시작한 뒤 `query_timeout`초 안에
+    끝나지 않으면 건너뜁니다. 스니펫은 쿼리 순서대로 모으고, 거의 같은 내용끼리 묶어 Tavily 점수가
+    가장 높은 것만 남깁니다 (near_dedup). Tavily 클라이언트가 없어 검색할 수 없으면 스니펫 목록은 None입니다.
+    """
+    queries = build_research_queries(*research_subject(product_info))
+    index = get_vector_index()
+    indexed_results: Dict[str, List[Dict]] = {}
+    if index is not None and (retrieval_mode or RESEARCH_RETRIEVAL_MODE) == "index_first":
+        indexed_results = await _aretrieve_from_index(index, queries, product_info)
+        logging.info(f"벡터 인덱스에서 {len(indexed_results)}/{len(queries)}개 쿼리의 결과를 찾았습니다.")
+    web_queries = [query for query in queries if query not in indexed_results]
+
+    if web_queries and not get_async_tavily_client():
+        logging.error("Tavily 클라이언트가 초기화되지 않아 검색을 건너뜁니다.")
+        if not indexed_results:
+            return None, []
+        web_queries = []
+    if web_queries:
+        logging.info(f"다음 쿼리로 웹 탐색을 수행합니다: {web_queries}")
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _search(query: str) -> List[Dict]:
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(_asearch_single_query(query), timeout=query_timeout)
+            except asyncio.TimeoutError:
+                logging.warning(f"'{query}' 검색이 시간 초과({query_timeout}초)되어 건너뜁니다.")
+            except Exception as e:
+                logging.warning(f"'{query}' 검색 중 오류 발생: {e}")
+            return []
+
+    web_results = dict(zip(web_queries, await asyncio.gather(*(_search(query) for query in web_queries))))
+    results_per_query = [indexed_results.get(query) or web_results.get(query, []) for query in queries]
+
+    if index is not None and web_results:
+        # 임베딩 API 호출이 포함되므로 결과를 기다리지 않고 백그라운드에서 인덱스에 추가
+        new_snippets = [dict(res, query=query) for query, results in web_results.items() for res in results]
+        _spawn_background(_aadd_to_index(index, new_snippets), "벡터 인덱스 스니펫 추가")
+
+    snippets = []
     unique_results = set()
-    for query in queries:
-        try:
-            response = tavily_client.search(query=query, search_depth="basic", max_results=3)
-            for res in response['results']:
-                content = res['content']
-                if content not in unique_results:
-                    final_summary += f"- {res['title']}: {content}\n"
-                    unique_results.add(content)
-        except Exception as e:
-            logging.warning(f"'{query}' 검색 중 오류 발생: {e}")
-            
+    for query, results in zip(queries, results_per_query):
+        for res in results:
+            content = res['content']
+            if content not in unique_results:
+                snippet = {"query": query, "title": res.get('title', ''), "url": res.get('url', ''),
+                           "content": content, "score": res.get('score', 0.0)}
+                if "similarity" in res:
+                    snippet["similarity"] = res["similarity"] # 인덱스에서 찾은 스니펫의 코사인 유사도
+                snippets.append(snippet)
+                unique_results.add(content)
+    # 미러/애그리게이터 사이트의 거의 같은 스니펫은 Tavily 점수가 가장 높은 것만 남김
+    deduped = await asyncio.to_thread(dedupe_near_duplicates, snippets, lambda s: s["score"] or 0.0)
+    if len(deduped) < len(snippets):
+        logging.info(f"거의 같은 내용의 스니펫 {len(snippets) - len(deduped)}개를 제거했습니다.")
+    snippets = deduped
+    return snippets, queries
+
+@_on_io_loop
+async def asearch_with_tavily_multi_query(product_info: dict, max_concurrency: int = TAVILY_MAX_WORKERS,
+                                          query_timeout: float = TAVILY_QUERY_TIMEOUT,
+                                          retrieval_mode: Optional[str] = None) -> Tuple[str, List[str]]:
+    """Tavily를 사용하여 웹에서 심층 정보를 검색하고, 수행된 쿼리 목록과 요약 결과를 반환합니다. (async)
+
+    지식 베이스(KNOWLEDGE_BASE_PATH)에 있는 원산지/상품이면 웹 검색 없이 미리 수집한 스니펫을 사용하고,
+    없으면 acollect_research_snippets로 스니펫을 모읍니다. 모인 스니펫은 상품/지역 관련도 순으로 정렬한 뒤
+    RESEARCH_CONTEXT_TOKEN_BUDGET 토큰 안으로 압축합니다. (context_compaction.compact_research_context)
+    """
+    knowledge_base = await asyncio.to_thread(get_knowledge_base) # 첫 호출 때 파일을 읽음
+    entry = knowledge_base.lookup(*research_subject(product_info)) if knowledge_base else None
+    if entry:
+        logging.info("지식 베이스에 있는 원산지/상품이므로 웹 검색을 건너뜁니다.")
+        snippets, queries = entry["snippets"], entry["queries"]
+    else:
+        snippets, queries = await acollect_research_snippets(product_info, max_concurrency, query_timeout, retrieval_mode)
+        if snippets is None:
+            return "Tavily 클라이언트가 설정되지 않았습니다.", []
+
+    # 토큰 계산(tiktoken 로드 포함)과 SimHash는 CPU 작업이므로 I/O 루프를 막지 않도록 별도 스레드에서 실행
+    final_summary, report = await asyncio.to_thread(compact_research_context, snippets, product_info,
+                                                    RESEARCH_CONTEXT_TOKEN_BUDGET)
+    logging.info(
+        f"웹 검색 결과 압축: 스니펫 {report['snippets_in']}개 → {report['snippets_out']}개, "
+        f"{report['original_tokens']} → {report['compacted_tokens']} 토큰 ({report['tokens_saved']} 토큰 절약)"
+    )
     return (final_summary if final_summary else "관련 웹 정보를 찾을 수 없습니다.", queries)
 
+def search_with_tavily_multi_query(product_info: dict, max_workers: int = TAVILY_MAX_WORKERS,
+                                   query_timeout: float = TAVILY_QUERY_TIMEOUT,
+                                   retrieval_mode: Optional[str] = None) -> Tuple[str, List[str]]:
+    """asearch_with_tavily_multi_query의 동기 버전입니다. `max_workers`는 동시에 실행할 쿼리 수입니다."""
+    return _run_sync(asearch_with_tavily_multi_query(product_info, max_workers, query_timeout, retrieval_mode))
 
-def generate_branding(product_info: dict, live_local_info: str) -> Optional[BrandingOutput]:
-    """LangChain 체인을 사용하여 브랜딩 콘텐츠를 생성합니다."""
-    if not llm:
+
+def _branding_inputs(product_info: dict, live_local_info: str) -> Dict[str, Any]:
+    product_info_str = "\n".join([f"- {key}: {value}" for key, value in product_info.items()])
+    return {
+        "product_info": product_info_str,
+        "live_local_info": live_local_info,
+    }
+
+@_on_io_loop
+async def agenerate_branding(product_info: dict, live_local_info: str) -> Optional[BrandingOutput]:
+    """LangChain 체인을 사용하여 브랜딩 콘텐츠를 생성합니다. (async)"""
+    chain = get_structured_chain(BrandingOutput)
+    if not chain:
         logging.error("LLM이 초기화되지 않아 브랜딩 생성을 건너뜁니다.")
         return None
         
-    chain = BRANDING_PROMPT | llm | json_parser_branding
     try:
-        product_info_str = "\n".join([f"- {key}: {value}" for key, value in product_info.items()])
-        response_dict = chain.invoke({
-            "product_info": product_info_str,
-            "live_local_info": live_local_info,
-            "format_instructions": json_parser_branding.get_format_instructions(),
-        })
+        response_dict = await chain.ainvoke(_branding_inputs(product_info, live_local_info))
         return BrandingOutput(**response_dict) # Pydantic 객체로 변환하여 반환
     except Exception as e:
         logging.error(f"브랜딩 생성 중 오류 발생: {e}\n{traceback.format_exc()}")
         return None
 
-def generate_detail_page_section_texts(branding_info: BrandingOutput, product_info: dict) -> List[Dict]:
-    """상세페이지 각 섹션에 사용할 텍스트를 생성합니다."""
+def generate_branding(product_info: dict, live_local_info: str) -> Optional[BrandingOutput]:
+    """LangChain 체인을 사용하여 브랜딩 콘텐츠를 생성합니다."""
+    return _run_sync(agenerate_branding(product_info, live_local_info))
+
+def stream_branding(product_info: dict, live_local_info: str) -> Iterator[Dict[str, Any]]:
+    """generate_branding의 스트리밍 버전입니다.
+
+    JsonOutputParser의 부분 JSON 파싱을 이용해, 지금까지 도착한 BrandingOutput 필드들을 담은 dict를
+    도착할 때마다 yield합니다. 마지막으로 yield된 dict가 완성된 결과이며, BrandingOutput(**dict)로 변환할 수 있습니다.
+    """
+    chain = get_structured_chain(BrandingOutput)
+    if not chain:
+        logging.error("LLM이 초기화되지 않아 브랜딩 생성을 건너뜁니다.")
+        return
+        
+    try:
+        for partial in chain.stream(_branding_inputs(product_info, live_local_info)):
+            yield partial
+    except Exception as e:
+        logging.error(f"브랜딩 스트리밍 중 오류 발생: {e}\n{traceback.format_exc()}")
+
+def generate_detail_page_section_texts(branding_info: BrandingOutput, product_info: dict,
+                                       max_concurrency: int = SECTION_TEXT_MAX_CONCURRENCY) -> List[Dict]:
+    """상세페이지 각 섹션에 사용할 텍스트를 생성합니다.
+
+    모든 섹션을 `chain.batch`로 한 번에 요청하며(동시 요청 수는 `max_concurrency`로 제한),
+    실패한 섹션만 기본 문구로 대체합니다. 결과는 항상 섹션 순서를 유지합니다.
+    """
+    llm = get_llm()
     if not llm:
         logging.error("LLM이 초기화되지 않아 텍스트 생성을 건너뜁니다.")
         return []
         
+    chain = get_prompt("SECTION_TEXT_DEFAULT_PROMPT") | llm | get_str_parser()
+    prompt_inputs = [
+        {
+            "section_number": i + 1,
+            "main_context": context['main'],
+            "sub_context": context['sub'],
+            "slogan": branding_info.slogan,
+            "story": branding_info.story,
+        }
+        for i, context in enumerate(DETAIL_PAGE_SECTION_CONTEXTS)
+    ]
+    try:
+        responses = chain.batch(prompt_inputs, config={"max_concurrency": max_concurrency}, return_exceptions=True)
+    except Exception as e:
+        logging.warning(f"상세페이지 텍스트 일괄 생성 실패: {e}")
+        responses = [e] * len(prompt_inputs)
+
     section_texts = []
-    chain = SECTION_TEXT_DEFAULT_PROMPT | llm | str_parser
-    
-    for i, context in enumerate(DETAIL_PAGE_SECTION_CONTEXTS):
-        try:
-            prompt_input = {
-                "section_number": i + 1,
-                "main_context": context['main'],
-                "sub_context": context['sub'],
-                "slogan": branding_info.slogan,
-                "story": branding_info.story,
-            }
-            res = chain.invoke(prompt_input)
-            parts = res.split('|', 1)
-            main_t = parts[0].strip() if parts else ""
-            sub_t = parts[1].strip() if len(parts) > 1 else ""
-            section_texts.append({"main_text": main_t, "sub_text": sub_t})
-        except Exception as e:
-            logging.warning(f"상세페이지 텍스트 섹션 {i+1} 생성 실패: {e}")
+    for i, res in enumerate(responses):
+        if isinstance(res, Exception):
+            logging.warning(f"상세페이지 텍스트 섹션 {i+1} 생성 실패: {res}")
             section_texts.append({"main_text": f"{product_info['상품명']}!", "sub_text": "신선함을 지금 만나보세요."})
+            continue
+        parts = res.split('|', 1)
+        main_t = parts[0].strip() if parts else ""
+        sub_t = parts[1].strip() if len(parts) > 1 else ""
+        section_texts.append({"main_text": main_t, "sub_text": sub_t})
             
     return section_texts
 
 # --- Image Generation & Processing ---
 
+# 상세페이지/오버레이에서 사용하는 폰트 크기 (시작 시 미리 로드)
+FONT_SIZES_IN_USE = (30, 32, 35, 40, 45, 50, 60, 70, 80)
+
+_font_cache: Dict[Tuple[Optional[str], int], Any] = {}
+_missing_font_paths: set = set()
+_font_cache_lock = threading.Lock()
+
+def get_font(path: str, size: int, fallback: bool = True):
+    """(경로, 크기)별로 한 번만 로드한 폰트를 반환합니다.
+
+    폰트 파일을 열 수 없으면 그 경로를 기억해두고 이후에는 디스크를 다시 읽지 않으며,
+    `fallback=True`이면 기본 폰트를, 아니면 IOError를 발생시킵니다.
+    """
+    from PIL import ImageFont
+
+    key = (path, size)
+    font = _font_cache.get(key)
+    if font is None and path not in _missing_font_paths:
+        with _font_cache_lock:
+            font = _font_cache.get(key)
+            if font is None and path not in _missing_font_paths:
+                try:
+                    font = ImageFont.truetype(path, size)
+                    _font_cache[key] = font
+                except IOError:
+                    logging.error(f"폰트 파일을 찾을 수 없습니다: {path}. 기본 폰트를 사용합니다.")
+                    _missing_font_paths.add(path)
+    if font is not None:
+        return font
+    if not fallback:
+        raise IOError(f"폰트 파일을 열 수 없습니다: {path}")
+
+    default_key = (None, size)
+    with _font_cache_lock:
+        if default_key not in _font_cache:
+            _font_cache[default_key] = ImageFont.load_default(size=size)
+        return _font_cache[default_key]
+
+def warm_font_cache(paths: Tuple[str, ...] = (FONT_PATH,), sizes: Tuple[int, ...] = FONT_SIZES_IN_USE) -> None:
+    """자주 쓰는 폰트 크기를 미리 로드해, 첫 이미지 생성 시 폰트 로딩 지연을 없앱니다."""
+    for path in paths:
+        for size in sizes:
+            get_font(path, size)
+
 def _draw_wrapped_text(draw, text, font, position_y, img_width, max_width_ratio=0.9, line_spacing=10, text_color=(0,0,0,255)):
-    words = text.split()
-    lines = []
-    current_line = ""
-    for word in words:
-        if draw.textbbox((0, 0), current_line + " " + word if current_line else word, font=font)[2] < img_width * max_width_ratio:
-            current_line += " " + word if current_line else word
-        else:
-            lines.append(current_line)
-            current_line = word
-    lines.append(current_line)
+    lines = wrap_text(text, font, img_width * max_width_ratio) or [("", 0)]
+    height = line_height(font)
 
-    total_text_height = sum(draw.textbbox((0, 0), line, font=font)[3] for line in lines) + (len(lines) - 1) * line_spacing
+    total_text_height = height * len(lines) + (len(lines) - 1) * line_spacing
     current_y = position_y - total_text_height / 2
 
-    for line in lines:
-        line_bbox = draw.textbbox((0, 0), line, font=font)
-        x = (img_width - line_bbox[2]) / 2
+    for line, line_width in lines:
+        x = (img_width - line_width) / 2
         draw.text((x, current_y), line, font=font, fill=text_color)
-        current_y += line_bbox[3] + line_spacing
+        current_y += height + line_spacing
     return current_y # 마지막으로 그려진 y 좌표 반환
 
-def _overlay_text_on_image(image_bytes: BytesIO, text_blocks: List[Dict]) -> Optional[bytes]:
-    """Pillow를 사용하여 이미지에 여러 텍스트 블록을 오버레이합니다."""
+# --- 이미지 출력 인코딩 ---
+# 이름별 인코딩 설정 (Pillow save 옵션). "png"는 Pillow 기본값과 같으며, 사진 위주의 상세페이지는
+# webp/jpeg가 훨씬 작고 빠르게 인코딩됩니다. 크기/시간 비교: benchmarks/bench_output_encoding.py
+OUTPUT_ENCODINGS: Dict[str, Dict[str, Any]] = {
+    "png": {"format": "PNG", "compress_level": 6},
+    "png_fast": {"format": "PNG", "compress_level": 1},
+    "jpeg": {"format": "JPEG", "quality": 90, "optimize": True, "progressive": True},
+    "webp": {"format": "WEBP", "quality": 85, "method": 4},
+}
+_FORMAT_FILE_INFO = {"PNG": ("image/png", "png"), "JPEG": ("image/jpeg", "jpg"), "WEBP": ("image/webp", "webp")}
+
+# 최종 상세페이지(다운로드용)와 화면 표시용 미리보기 설정
+def _encoding_from_env(name: str, default: str) -> str:
+    """환경 변수의 인코딩 이름을 확인하고, OUTPUT_ENCODINGS에 없으면 경고 후 `default`를 사용합니다."""
+    value = os.getenv(name, default).strip().lower()
+    if value not in OUTPUT_ENCODINGS:
+        logging.warning(f"{name}={value!r}는 지원하지 않는 인코딩이므로 {default!r}를 사용합니다. "
+                        f"(사용 가능: {', '.join(OUTPUT_ENCODINGS)})")
+        return default
+    return value
+
+DETAIL_PAGE_OUTPUT_FORMAT = _encoding_from_env("DETAIL_PAGE_OUTPUT_FORMAT", "png")
+DETAIL_PAGE_PREVIEW_FORMAT = _encoding_from_env("DETAIL_PAGE_PREVIEW_FORMAT", "jpeg")
+DETAIL_PAGE_PREVIEW_SCALE = float(os.getenv("DETAIL_PAGE_PREVIEW_SCALE", "0.5"))
+DETAIL_PAGE_PREVIEW_QUALITY = int(os.getenv("DETAIL_PAGE_PREVIEW_QUALITY", "75"))
+
+def output_file_info(encoding: str) -> Tuple[str, str]:
+    """인코딩 이름에 맞는 (MIME 타입, 파일 확장자)를 반환합니다."""
+    return _FORMAT_FILE_INFO[OUTPUT_ENCODINGS[encoding]["format"]]
+
+def encode_image(image: Image.Image, encoding: str = "png", **overrides) -> Tuple[bytes, Dict[str, Any]]:
+    """PIL 이미지를 `encoding` 설정으로 인코딩하고 (bytes, 보고서)를 반환합니다.
+
+    `overrides`로 설정 값(quality, compress_level, progressive 등)을 바꿀 수 있습니다.
+    보고서에는 형식, 이미지 크기, 결과 용량(bytes), 인코딩 시간(ms)이 들어 있습니다.
+    """
+    options = {**OUTPUT_ENCODINGS[encoding], **overrides}
+    image_format = options.pop("format")
+    if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    start = time.perf_counter()
+    output_buffer = BytesIO()
+    image.save(output_buffer, format=image_format, **options)
+    data = output_buffer.getvalue()
+    report = {
+        "encoding": encoding,
+        "format": image_format,
+        "size": image.size,
+        "bytes": len(data),
+        "encode_ms": (time.perf_counter() - start) * 1000,
+    }
+    return data, report
+
+def make_preview(image: Image.Image, scale: float = DETAIL_PAGE_PREVIEW_SCALE,
+                 encoding: str = DETAIL_PAGE_PREVIEW_FORMAT,
+                 quality: int = DETAIL_PAGE_PREVIEW_QUALITY) -> Tuple[bytes, Dict[str, Any]]:
+    """화면 표시용으로 축소한 미리보기 이미지를 인코딩해 (bytes, 보고서)를 반환합니다."""
+    from PIL import Image
+
+    if 0 < scale < 1:
+        factor = round(1 / scale)
+        if abs(1 / factor - scale) < 1e-6:
+            image = image.reduce(factor) # 1/2, 1/3처럼 정수배 축소는 reduce가 가장 빠름
+        else:
+            image = image.resize((round(image.width * scale), round(image.height * scale)), Image.Resampling.BILINEAR)
+    return encode_image(image, encoding, quality=quality)
+
+def _log_encoding(label: str, report: Dict[str, Any]) -> None:
+    logging.info(f"{label} 인코딩: {report['format']} {report['size'][0]}x{report['size'][1]}, "
+                 f"{report['bytes'] / 1024:.1f}KB, {report['encode_ms']:.0f}ms")
+
+def _decode_image(image: Union[Image.Image, bytes]) -> Image.Image:
+    """PNG/JPEG bytes를 PIL 이미지로 디코딩합니다. 이미 PIL 이미지이면 그대로 반환합니다."""
+    from PIL import Image
+
+    if isinstance(image, Image.Image):
+        return image
+    decoded = Image.open(BytesIO(image))
+    decoded.load()
+    return decoded
+
+def _overlay_text_on_image(image: Union[Image.Image, bytes], text_blocks: List[Dict],
+                           output_format: str = "png") -> Optional[bytes]:
+    """Pillow를 사용하여 이미지에 여러 텍스트 블록을 오버레이하고 `output_format`으로 인코딩한 bytes를 반환합니다.
+
+    PIL 이미지를 넘기면 그 이미지 위에 바로 그립니다. RGB/RGBA 이미지는 모드를 바꾸지 않으므로 복사본을 만들지 않습니다.
+    """
+    from PIL import ImageDraw
+
     try:
-        img = Image.open(image_bytes).convert("RGBA")
+        img = _decode_image(image)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA")
         draw = ImageDraw.Draw(img)
         width, height = img.size
         top_margin_center = ((height - 1024) // 2) / 2
@@ -253,13 +1129,8 @@ def _overlay_text_on_image(image_bytes: BytesIO, text_blocks: List[Dict]) -> Opt
             position = block.get("position", "top")
             y_center = top_margin_center if position == 'top' else bottom_margin_center
             
-            try:
-                main_font = ImageFont.truetype(FONT_PATH, block.get("main_font_size", 50))
-                sub_font = ImageFont.truetype(FONT_PATH, block.get("sub_font_size", 30))
-            except IOError:
-                logging.error(f"폰트 파일을 찾을 수 없습니다: {FONT_PATH}. 기본 폰트를 사용합니다.")
-                main_font = ImageFont.load_default(size=block.get("main_font_size", 50))
-                sub_font = ImageFont.load_default(size=block.get("sub_font_size", 30))
+            main_font = get_font(FONT_PATH, block.get("main_font_size", 50))
+            sub_font = get_font(FONT_PATH, block.get("sub_font_size", 30))
             
             # 메인 텍스트 그리기
             last_y = _draw_wrapped_text(draw, block["main_text"], main_font, y_center, width)
@@ -268,21 +1139,40 @@ def _overlay_text_on_image(image_bytes: BytesIO, text_blocks: List[Dict]) -> Opt
             if block.get("sub_text"):
                 _draw_wrapped_text(draw, block["sub_text"], sub_font, last_y + 15, width, max_width_ratio=0.8, line_spacing=5)
 
-        output_buffer = BytesIO()
-        img.save(output_buffer, format="PNG")
-        return output_buffer.getvalue()
+        data, report = encode_image(img, output_format)
+        _log_encoding("상세페이지 이미지", report)
+        return data
 
     except Exception as e:
         logging.error(f"이미지 텍스트 오버레이 중 오류: {e}")
         return None
 
-def _generate_single_image_with_text(index: int, product_info: dict, section_text: dict, branding_slogan: str) -> Optional[bytes]:
+def _images_generate_with_retry(**kwargs):
+    """DALL-E 이미지 생성 요청을 보내고, rate limit에 걸리면 지수 백오프로 재시도합니다."""
+    import openai
+
+    for attempt in range(DALLE_RATE_LIMIT_RETRIES + 1):
+        try:
+            return get_openai_client().images.generate(**kwargs)
+        except openai.RateLimitError:
+            if attempt == DALLE_RATE_LIMIT_RETRIES:
+                raise
+            delay = DALLE_RATE_LIMIT_BACKOFF * (2 ** attempt)
+            logging.warning(f"DALL-E rate limit 도달, {delay:.0f}초 후 재시도합니다 ({attempt + 1}/{DALLE_RATE_LIMIT_RETRIES})")
+            time.sleep(delay)
+
+def _image_bytes_from_response(response) -> bytes:
+    """`response_format="b64_json"`으로 요청한 DALL-E 응답에서 이미지 bytes를 꺼냅니다. (별도 다운로드 없음)"""
+    return base64.b64decode(response.data[0].b64_json)
+
+def _generate_single_image_with_text(index: int, product_info: dict, section_text: dict, branding_slogan: str,
+                                     output_format: str = "png") -> Optional[bytes]:
     """DALL-E로 단일 이미지를 생성하고 텍스트를 합성합니다."""
     try:
         logging.info(f"상세페이지 이미지 {index + 1}/{NUM_DETAIL_PAGES} 생성 시작...")
         
         # 1. DALL-E 프롬프트 준비
-        frame_prompt = DETAIL_PAGE_IMAGE_FRAMES[index]
+        frame_prompt = get_prompt(DETAIL_PAGE_IMAGE_FRAME_NAMES[index])
         theme_template = DETAIL_PAGE_IMAGE_THEMES[index]
         theme = theme_template.format(
             product_name=product_info['상품명'], 
@@ -291,11 +1181,11 @@ def _generate_single_image_with_text(index: int, product_info: dict, section_tex
         final_prompt = frame_prompt.format(theme=theme)
         
         # 2. DALL-E 이미지 생성
-        response = openai.images.generate(
-            model="dall-e-3", prompt=final_prompt, n=1, size="1024x1792", quality="standard"
+        response = _images_generate_with_retry(
+            model="dall-e-3", prompt=final_prompt, n=1, size="1024x1792", quality="standard",
+            response_format="b64_json"
         )
-        image_url = response.data[0].url
-        image_bytes = BytesIO(requests.get(image_url).content)
+        image = _decode_image(_image_bytes_from_response(response))
         
         # 3. 텍스트 블록 구성
         text_blocks = []
@@ -307,40 +1197,56 @@ def _generate_single_image_with_text(index: int, product_info: dict, section_tex
             text_blocks.append({"position": "top", "main_text": section_text["main_text"], "sub_text": section_text["sub_text"], "main_font_size": 60, "sub_font_size": 40})
             
         # 4. 텍스트 오버레이
-        return _overlay_text_on_image(image_bytes, text_blocks)
+        return _overlay_text_on_image(image, text_blocks, output_format)
 
     except Exception as e:
         logging.error(f"상세페이지 이미지 {index + 1} 생성 중 오류: {e}\n{traceback.format_exc()}")
         return None
 
-def generate_all_detail_page_images(product_info: dict, branding_info: BrandingOutput) -> Tuple[List[Optional[bytes]], List[Dict]]:
-    """5개의 상세페이지 이미지를 생성하고 텍스트를 합성합니다."""
+def generate_all_detail_page_images(product_info: dict, branding_info: BrandingOutput,
+                                    max_workers: int = DALLE_MAX_WORKERS,
+                                    output_format: str = DETAIL_PAGE_OUTPUT_FORMAT) -> Tuple[List[Optional[bytes]], List[Dict]]:
+    """5개의 상세페이지 이미지를 생성하고 텍스트를 합성합니다. 각 이미지는 `output_format`으로 인코딩됩니다.
+
+    각 이미지는 최대 `max_workers`개의 스레드에서 동시에 생성됩니다. 결과 리스트는 이미지 순서를 유지하며,
+    실패한 이미지는 해당 자리에 None으로 남기고 나머지 이미지는 그대로 반환합니다.
+    """
     if not OPENAI_API_KEY:
         logging.error("OpenAI API 키가 설정되지 않아 이미지 생성을 건너뜁니다.")
         return [], []
         
     section_texts = generate_detail_page_section_texts(branding_info, product_info)
-    processed_images = []
+    if len(section_texts) < NUM_DETAIL_PAGES:
+        logging.error("상세페이지 섹션 텍스트가 부족하여 이미지 생성을 건너뜁니다.")
+        return [], section_texts
 
-    # [Refactor] for i in range(1) 버그 수정 및 병렬 처리 준비 (현재는 순차 실행)
-    for i in range(1):
-        # [Refactor] 복잡한 로직을 헬퍼 함수 호출로 대체
-        final_image = _generate_single_image_with_text(i, product_info, section_texts[i], branding_info.slogan)
-        processed_images.append(final_image)
-        
+    processed_images: List[Optional[bytes]] = [None] * NUM_DETAIL_PAGES
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="dalle") as executor:
+        futures = {
+            executor.submit(_generate_single_image_with_text, i, product_info, section_texts[i], branding_info.slogan,
+                            output_format): i
+            for i in range(NUM_DETAIL_PAGES)
+        }
+        for future in as_completed(futures):
+            processed_images[futures[future]] = future.result()
+
+    failed_slots = [i + 1 for i, image in enumerate(processed_images) if image is None]
+    if failed_slots:
+        logging.warning(f"상세페이지 이미지 {len(failed_slots)}/{NUM_DETAIL_PAGES}개 생성 실패 (슬롯: {failed_slots})")
     return processed_images, section_texts
 
 
 def generate_marketing_content(platform: str, branding_info: BrandingOutput, product_info: dict) -> Dict:
     """플랫폼별 마케팅 텍스트와 이미지를 생성합니다."""
     # 텍스트 생성
+    json_llm = get_json_llm()
     if not json_llm:
         logging.error("LLM이 초기화되지 않아 마케팅 텍스트 생성을 건너뜁니다.")
         return {"text": None, "image": None}
         
     text_content = None
     try:
-        chain = MARKETING_TEXT_PROMPT | json_llm | JsonOutputParser()
+        chain = get_prompt("MARKETING_TEXT_PROMPT") | json_llm | get_json_parser()
         text_content = chain.invoke({
             "platform": platform,
             "branding_info": branding_info.model_dump_json(),
@@ -354,53 +1260,99 @@ def generate_marketing_content(platform: str, branding_info: BrandingOutput, pro
     if platform != "네이버 블로그" and OPENAI_API_KEY:
         image_prompt = f"A professional marketing image for {platform}. Theme: '{branding_info.slogan}'. Featuring: High-quality photo of '{product_info['상품명']}' from '{product_info['원산지']}'. Style: clean, appealing, with Korean text '{branding_info.slogan}' harmoniously integrated. Photorealistic."
         try:
-            response = openai.images.generate(model="dall-e-3", prompt=image_prompt, n=1, size="1024x1024")
+            response = get_openai_client().images.generate(model="dall-e-3", prompt=image_prompt, n=1, size="1024x1024")
             image_url = response.data[0].url
         except Exception as e:
             logging.error(f"마케팅 이미지 생성 중 오류: {e}")
             
     return {"text": text_content, "image": image_url}
 
-def generate_page_texts(product_info: dict, branding_info: BrandingOutput, live_local_info: str) -> Optional[PageTextContent]:
-    """상세페이지에 필요한 6가지 텍스트 콘텐츠를 생성합니다."""
-    parser = JsonOutputParser(pydantic_object=PageTextContent)
-    chain = GENERATE_PAGE_TEXTS_PROMPT | llm | parser
+@_on_io_loop
+async def agenerate_page_texts(product_info: dict, branding_info: BrandingOutput, live_local_info: str,
+                               on_progress: Optional[ProgressCallback] = None) -> Optional[PageTextContent]:
+    """상세페이지에 필요한 6가지 텍스트 콘텐츠를 생성합니다. 진행 상황은 `on_progress`로 알립니다. (async)"""
+    notify = on_progress or log_progress
+    chain = get_structured_chain(PageTextContent)
+    if not chain:
+        notify("error", "LLM이 초기화되지 않아 상세페이지 텍스트 생성을 건너뜁니다.")
+        return None
     
-    st.info("상세페이지에 사용할 텍스트를 생성 중입니다...")
+    notify("info", "상세페이지에 사용할 텍스트를 생성 중입니다...")
     try:
-        page_texts = chain.invoke({
+        page_texts = await chain.ainvoke({
             "product_info": product_info,
             "live_local_info": live_local_info,
             "branding_info": branding_info.model_dump_json(),
-            "format_instructions": parser.get_format_instructions()
         })
         return page_texts
     except Exception as e:
-        st.error(f"상세페이지 텍스트 생성 중 오류: {e}")
+        notify("error", f"상세페이지 텍스트 생성 중 오류: {e}")
         return None
 
-def generate_product_image(product_info: dict) -> Optional[str]:
-    """DALL-E로 제품 이미지를 생성하고 URL을 반환합니다."""
-    st.info("상품 이미지를 생성 중입니다...")
+def generate_page_texts(product_info: dict, branding_info: BrandingOutput, live_local_info: str,
+                        on_progress: Optional[ProgressCallback] = None) -> Optional[PageTextContent]:
+    """상세페이지에 필요한 6가지 텍스트 콘텐츠를 생성합니다. 진행 상황은 `on_progress`로 알립니다."""
+    return _run_sync(agenerate_page_texts(product_info, branding_info, live_local_info, on_progress))
+
+async def _aimages_generate_with_retry(**kwargs):
+    """_images_generate_with_retry의 async 버전 (AsyncOpenAI 사용)"""
+    import openai
+
+    for attempt in range(DALLE_RATE_LIMIT_RETRIES + 1):
+        try:
+            return await get_async_openai_client().images.generate(**kwargs)
+        except openai.RateLimitError:
+            if attempt == DALLE_RATE_LIMIT_RETRIES:
+                raise
+            delay = DALLE_RATE_LIMIT_BACKOFF * (2 ** attempt)
+            logging.warning(f"DALL-E rate limit 도달, {delay:.0f}초 후 재시도합니다 ({attempt + 1}/{DALLE_RATE_LIMIT_RETRIES})")
+            await asyncio.sleep(delay)
+
+@_on_io_loop
+async def agenerate_product_image(product_info: dict, reuse_previous: bool = False,
+                                  on_progress: Optional[ProgressCallback] = None) -> Optional[bytes]:
+    """DALL-E로 제품 이미지를 생성하고 PNG 이미지 bytes를 반환합니다. (async)
+
+    이미지는 `b64_json` 응답으로 받으므로 URL에서 다시 내려받지 않습니다. 생성된 이미지는 로컬 이미지 저장소에도
+    저장되며, `reuse_previous=True`이면 같은 프롬프트로 이전에 생성한 이미지가 있을 때 DALL-E를 다시 호출하지 않고
+    저장된 이미지를 반환합니다. 진행 상황은 `on_progress`로 알립니다.
+    """
+    notify = on_progress or log_progress
+    notify("info", "상품 이미지를 생성 중입니다...")
     try:
         # prompts.py에 정의된 템플릿을 사용
         product_keyword = product_info.get('핵심상품명', product_info.get('상품명', ''))
-        prompt_text = DALLE_PRODUCT_IMAGE_PROMPT.format(
+        prompt_text = get_prompt("DALLE_PRODUCT_IMAGE_PROMPT").format(
             product_name=product_keyword,
             origin=product_info.get('원산지', '')
         )
-        response = openai.images.generate(
-            model="dall-e-3",
-            prompt=prompt_text,
-            n=1,
-            size="1024x1792",
-            quality="standard",
-        )
-        return response.data[0].url
+        generation_options = {"model": "dall-e-3", "size": "1024x1792", "quality": "standard"}
+        store = get_image_store()
+        key = ImageStore.make_key(prompt_text, **generation_options)
+        if store and reuse_previous:
+            cached = await asyncio.to_thread(store.get, key)
+            if cached is not None:
+                logging.info("이전에 생성한 상품 이미지를 재사용합니다.")
+                return cached
+
+        response = await _aimages_generate_with_retry(prompt=prompt_text, n=1, response_format="b64_json",
+                                                      **generation_options)
+        image_data = _image_bytes_from_response(response)
+        if store:
+            try:
+                await asyncio.to_thread(store.put, key, image_data)
+            except Exception as e:
+                logging.warning(f"생성 이미지 저장 실패: {e}")
+        return image_data
     except Exception as e:
-        st.error(f"DALL-E 이미지 생성 중 오류: {e}")
+        notify("error", f"DALL-E 이미지 생성 중 오류: {e}")
         return None
 
+def generate_product_image(product_info: dict, reuse_previous: bool = False,
+                           on_progress: Optional[ProgressCallback] = None) -> Optional[bytes]:
+    """DALL-E로 제품 이미지를 생성하고 PNG 이미지 bytes를 반환합니다. 자세한 동작은 agenerate_product_image를 참고하세요."""
+    return _run_sync(agenerate_product_image(product_info, reuse_previous, on_progress))
+
 class DesignConfig:
     """디자인 관련 설정을 중앙에서 관리하는 클래스"""
     CANVAS_SIZE = (1080, 1500)
@@ -419,25 +1371,39 @@ class DesignConfig:
 
     @staticmethod
     def get_fonts(font_bold_path: str, font_regular_path: str) -> Dict[str, ImageFont.FreeTypeFont]:
-        """폰트 파일을 로드하여 딕셔너리로 반환"""
+        """폰트 파일을 로드하여 딕셔너리로 반환 (한 번 로드한 폰트는 캐시에서 재사용)"""
         try:
             return {
-                'title': ImageFont.truetype(font_bold_path, 80),
-                'slogan': ImageFont.truetype(font_regular_path, 45),
-                'heading': ImageFont.truetype(font_bold_path, 40),
-                'body': ImageFont.truetype(font_regular_path, 32),
-                'closing': ImageFont.truetype(font_bold_path, 50),
+                'title': get_font(font_bold_path, 80, fallback=False),
+                'slogan': get_font(font_regular_path, 45, fallback=False),
+                'heading': get_font(font_bold_path, 40, fallback=False),
+                'body': get_font(font_regular_path, 32, fallback=False),
+                'closing': get_font(font_bold_path, 50, fallback=False),
             }
         except Exception as e:
             logging.error(f"폰트 파일 로딩 실패: {e}")
             raise # 폰트 로딩 실패 시, 진행이 불가능하므로 예외를 다시 발생시킴
 
-def _load_image_from_url(url: str, size: Tuple[int, int]) -> Optional[Image.Image]:
-    """URL에서 이미지를 로드하고 리사이즈하여 반환"""
+def _load_product_image(source: Union[Image.Image, bytes, str], size: Tuple[int, int]) -> Optional[Image.Image]:
+    """상품 이미지를 `size` 안에 들어가도록 줄여서 반환합니다.
+
+    `source`는 PIL 이미지, 이미지 bytes, 또는 (이전 방식의) 로컬 경로/URL일 수 있습니다.
+    bytes/경로는 여기서 한 번만 디코딩하며, 넘겨받은 PIL 이미지는 변경하지 않습니다.
+    """
+    from PIL import Image
+
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        image = Image.open(BytesIO(response.content))
+        if isinstance(source, Image.Image):
+            ratio = min(size[0] / source.width, size[1] / source.height)
+            if ratio >= 1:
+                return source
+            return source.resize((round(source.width * ratio), round(source.height * ratio)), Image.Resampling.LANCZOS)
+        if isinstance(source, (bytes, bytearray)):
+            image = Image.open(BytesIO(source))
+        elif os.path.isfile(source):
+            image = Image.open(source)
+        else:
+            image = Image.open(BytesIO(_http_get(source)))
         image.thumbnail(size)
         return image
     except Exception as e:
@@ -456,142 +1422,231 @@ def _draw_text_in_box(draw: ImageDraw.ImageDraw, box: Tuple[int, int, int, int],
         draw.rounded_rectangle(bg_box, radius=corner_radius, fill=box_color)
 
     # 텍스트 줄바꿈 로직
-    words = text.split()
-    if not words: return
-    lines = []
-    current_line = ""
-    for word in words:
-        if draw.textbbox((0, 0), f"{current_line} {word}".strip(), font=font)[2] < box[2]:
-            current_line = f"{current_line} {word}".strip()
-        else:
-            lines.append(current_line)
-            current_line = word
-    lines.append(current_line)
+    lines = wrap_text(text, font, box[2])
+    if not lines: return
 
     # 텍스트 그리기
     y_text = box[1]
+    height = line_height(font)
     text_color = kwargs.get('text_color', DesignConfig.COLORS['black'])
-    for line in lines:
-        line_bbox = draw.textbbox((0, 0), line, font=font)
-        line_width = line_bbox[2] - line_bbox[0]
+    for line, line_width in lines:
         x_text = box[0] + (box[2] - line_width) / 2
         draw.text((x_text, y_text), line, font=font, fill=text_color)
-        y_text += (line_bbox[3] - line_bbox[1]) + 10 # 줄 간격
+        y_text += height + 10 # 줄 간격
 
-def compose_final_image(page_texts: PageTextContent, image_url: str, font_bold_path: str, 
-                        font_regular_path: str) -> Optional[BytesIO]:
-    """생성된 콘텐츠를 조립하여 최종 상세페이지 이미지를 생성합니다."""
-    try:
-        # 1. 설정 및 준비
-        config = DesignConfig()
-        fonts = config.get_fonts(font_bold_path, font_regular_path)
-        canvas = Image.new('RGB', config.CANVAS_SIZE, config.COLORS['white'])
-        draw = ImageDraw.Draw(canvas)
-        
-        # 2. DALL-E 이미지 로드 및 배치
-        product_image = _load_image_from_url(image_url, config.IMAGE_THUMBNAIL_SIZE)
-        img_y = (config.CANVAS_SIZE[1] - config.IMAGE_THUMBNAIL_SIZE[1]) // 2
-        if product_image:
-            img_x = (config.LEFT_SECTION_WIDTH - product_image.width) // 2
-            canvas.paste(product_image, (img_x, img_y))
-
-        # 3. 텍스트 요소 배치
-        # 상단 제목 및 슬로건
-        _draw_text_in_box(draw, (50, 100, 980, 150), page_texts.title, fonts['title'])
-        _draw_text_in_box(draw, (50, 220, 980, 100), page_texts.slogan, fonts['slogan'], text_color=config.COLORS['grey'])
-
-        # 오른쪽 정보 블록
-        RIGHT_X = config.LEFT_SECTION_WIDTH + 33
-        RIGHT_WIDTH = config.CANVAS_SIZE[0] - RIGHT_X - 33
-        BOX_HEIGHT, BOX_SPACING = 200, 45
-        
-        box_y_positions = [img_y + 63, img_y + 63 + BOX_HEIGHT + BOX_SPACING, img_y + 63 + (BOX_HEIGHT + BOX_SPACING) * 2]
-        box_texts = [page_texts.region_story, page_texts.product_features, page_texts.nutrition_info]
-        box_colors = [config.COLORS['box1'], config.COLORS['box2'], config.COLORS['box3']]
+def _compose_canvas(page_texts: PageTextContent, product_image: Union[Image.Image, bytes, str],
+                    font_bold_path: str, font_regular_path: str) -> Image.Image:
+    """상세페이지 캔버스를 조립해 PIL 이미지로 반환합니다. (인코딩 전)"""
+    from PIL import Image, ImageDraw
 
-        for y, text, color in zip(box_y_positions, box_texts, box_colors):
-            _draw_text_in_box(draw, (RIGHT_X, y, RIGHT_WIDTH, BOX_HEIGHT), text, 
-                              fonts['body'], box_color=color, corner_radius=30)
-            
-        # 하단 마무리 문구
-        _draw_text_in_box(draw, (50, 1270, 980, 100), page_texts.closing_statement, 
-                          fonts['closing'], text_color=config.COLORS['dark_grey'])
+    # 1. 설정 및 준비
+    config = DesignConfig()
+    fonts = config.get_fonts(font_bold_path, font_regular_path)
+    canvas = Image.new('RGB', config.CANVAS_SIZE, config.COLORS['white'])
+    draw = ImageDraw.Draw(canvas)
+    
+    # 2. DALL-E 이미지 로드 및 배치
+    thumbnail = _load_product_image(product_image, config.IMAGE_THUMBNAIL_SIZE)
+    img_y = (config.CANVAS_SIZE[1] - config.IMAGE_THUMBNAIL_SIZE[1]) // 2
+    if thumbnail:
+        img_x = (config.LEFT_SECTION_WIDTH - thumbnail.width) // 2
+        canvas.paste(thumbnail, (img_x, img_y))
+
+    # 3. 텍스트 요소 배치
+    # 상단 제목 및 슬로건
+    _draw_text_in_box(draw, (50, 100, 980, 150), page_texts.title, fonts['title'])
+    _draw_text_in_box(draw, (50, 220, 980, 100), page_texts.slogan, fonts['slogan'], text_color=config.COLORS['grey'])
+
+    # 오른쪽 정보 블록
+    RIGHT_X = config.LEFT_SECTION_WIDTH + 33
+    RIGHT_WIDTH = config.CANVAS_SIZE[0] - RIGHT_X - 33
+    BOX_HEIGHT, BOX_SPACING = 200, 45
+    
+    box_y_positions = [img_y + 63, img_y + 63 + BOX_HEIGHT + BOX_SPACING, img_y + 63 + (BOX_HEIGHT + BOX_SPACING) * 2]
+    box_texts = [page_texts.region_story, page_texts.product_features, page_texts.nutrition_info]
+    box_colors = [config.COLORS['box1'], config.COLORS['box2'], config.COLORS['box3']]
+
+    for y, text, color in zip(box_y_positions, box_texts, box_colors):
+        _draw_text_in_box(draw, (RIGHT_X, y, RIGHT_WIDTH, BOX_HEIGHT), text, 
+                          fonts['body'], box_color=color, corner_radius=30)
         
-        # 4. 최종 이미지 버퍼로 반환
-        output_buffer = BytesIO()
-        canvas.save(output_buffer, format="PNG")
-        output_buffer.seek(0)
-        return output_buffer
+    # 하단 마무리 문구
+    _draw_text_in_box(draw, (50, 1270, 980, 100), page_texts.closing_statement, 
+                      fonts['closing'], text_color=config.COLORS['dark_grey'])
+    return canvas
 
+def compose_final_image_with_preview(page_texts: PageTextContent, product_image: Union[Image.Image, bytes, str],
+                                     font_bold_path: str, font_regular_path: str,
+                                     output_format: str = DETAIL_PAGE_OUTPUT_FORMAT,
+                                     preview: bool = True) -> Optional[Tuple[BytesIO, Optional[bytes]]]:
+    """상세페이지를 한 번 조립해 (다운로드용 원본 버퍼, 화면 표시용 미리보기 bytes)를 반환합니다.
+
+    원본은 `output_format`(OUTPUT_ENCODINGS의 이름)으로 인코딩하며, `preview=True`이면 같은 캔버스를 축소해
+    DETAIL_PAGE_PREVIEW_FORMAT으로 빠르게 인코딩한 미리보기도 만듭니다. 실패하면 None을 반환합니다.
+    """
+    try:
+        canvas = _compose_canvas(page_texts, product_image, font_bold_path, font_regular_path)
+        data, report = encode_image(canvas, output_format)
+        _log_encoding("상세페이지", report)
+        preview_data = None
+        if preview:
+            preview_data, preview_report = make_preview(canvas)
+            _log_encoding("상세페이지 미리보기", preview_report)
+        return BytesIO(data), preview_data
     except Exception as e:
         logging.error(f"이미지 조립 중 심각한 오류 발생: {e}\n{traceback.format_exc()}")
         return None
 
-def _generate_content(prompt_template, pydantic_model, invoke_params):
+def compose_final_image(page_texts: PageTextContent, product_image: Union[Image.Image, bytes, str], font_bold_path: str, 
+                        font_regular_path: str, output_format: str = DETAIL_PAGE_OUTPUT_FORMAT) -> Optional[BytesIO]:
+    """생성된 콘텐츠를 조립하여 최종 상세페이지 이미지를 `output_format`으로 인코딩해 반환합니다.
+
+    `product_image`는 PIL 이미지 또는 이미지 bytes를 권장하며, 이전 방식의 로컬 경로/URL도 받습니다.
+    """
+    result = compose_final_image_with_preview(page_texts, product_image, font_bold_path, font_regular_path,
+                                              output_format, preview=False)
+    return result[0] if result else None
+
+# (페이지 텍스트, 상품 이미지 bytes, 최종 이미지 버퍼, 미리보기 bytes)
+DetailPageResult = Tuple[Optional[Dict], Optional[bytes], Optional[BytesIO], Optional[bytes]]
+
+@_on_io_loop
+async def abuild_detail_page(product_info: dict, branding_info: BrandingOutput, live_local_info: str,
+                             font_bold_path: str, font_regular_path: str,
+                             reuse_previous: bool = False,
+                             on_progress: Optional[ProgressCallback] = None,
+                             output_format: str = DETAIL_PAGE_OUTPUT_FORMAT,
+                             preview: bool = False) -> DetailPageResult:
+    """텍스트 생성과 DALL-E 이미지 생성을 동시에 실행한 뒤, 두 결과가 모두 준비되면 최종 상세페이지를 조립합니다. (async)
+
+    두 단계는 서로 의존하지 않으므로 전체 소요 시간은 두 단계의 합이 아니라 더 오래 걸리는 쪽에 가깝습니다.
+    반환값은 (페이지 텍스트 dict, 상품 이미지 PNG bytes, 최종 이미지 버퍼, 미리보기 bytes)이며, 실패한 단계는 None입니다.
+    상품 이미지는 DALL-E 응답에서 받은 bytes를 그대로 조립 단계에 넘기므로 다시 내려받지 않습니다.
+    `reuse_previous`는 agenerate_product_image에 그대로 전달됩니다.
+    최종 이미지는 `output_format`으로 인코딩하며, 미리보기는 `preview=True`일 때만 만듭니다.
+
+    `on_progress`는 I/O 루프 스레드에서 호출되므로 스레드 안전해야 합니다. UI에 표시하려면
+    ProgressEventQueue를 넘기고, 메인 스레드에서 `drain()`으로 꺼내 표시하세요. (submit_detail_page 참고)
+    """
+    page_texts, product_image = await asyncio.gather(
+        agenerate_page_texts(product_info, branding_info, live_local_info, on_progress),
+        agenerate_product_image(product_info, reuse_previous, on_progress),
+    )
+
+    if not page_texts or not product_image:
+        logging.error("텍스트 또는 이미지 생성에 실패하여 상세페이지 조립을 건너뜁니다.")
+        return page_texts, product_image, None, None
+
+    try:
+        page_texts_object = PageTextContent(**page_texts)
+    except Exception as e:
+        logging.error(f"상세페이지 텍스트 형식이 올바르지 않습니다: {e}")
+        return page_texts, product_image, None, None
+    # 이미지 조립/인코딩은 CPU 작업이므로 I/O 루프를 막지 않도록 별도 스레드에서 실행
+    composed = await asyncio.to_thread(compose_final_image_with_preview, page_texts_object, product_image,
+                                       font_bold_path, font_regular_path, output_format, preview)
+    final_image_buffer, preview_image = composed if composed else (None, None)
+    return page_texts, product_image, final_image_buffer, preview_image
+
+def build_detail_page(product_info: dict, branding_info: BrandingOutput, live_local_info: str,
+                      font_bold_path: str, font_regular_path: str,
+                      reuse_previous: bool = False,
+                      on_progress: Optional[ProgressCallback] = None,
+                      output_format: str = DETAIL_PAGE_OUTPUT_FORMAT,
+                      preview: bool = False) -> DetailPageResult:
+    """abuild_detail_page의 동기 버전입니다."""
+    return _run_sync(abuild_detail_page(product_info, branding_info, live_local_info, font_bold_path,
+                                        font_regular_path, reuse_previous, on_progress, output_format, preview))
+
+def submit_detail_page(product_info: dict, branding_info: BrandingOutput, live_local_info: str,
+                       font_bold_path: str, font_regular_path: str,
+                       reuse_previous: bool = False,
+                       on_progress: Optional[ProgressCallback] = None,
+                       output_format: str = DETAIL_PAGE_OUTPUT_FORMAT,
+                       preview: bool = False) -> "Future[DetailPageResult]":
+    """abuild_detail_page를 공유 I/O 루프에 예약하고, 완료를 기다리지 않고 Future를 반환합니다.
+
+    호출한 쪽은 Future가 끝날 때까지 ProgressEventQueue를 `drain()`하며 진행 상황을 바로 표시할 수 있습니다.
+    """
+    return asyncio.run_coroutine_threadsafe(
+        abuild_detail_page(product_info, branding_info, live_local_info, font_bold_path, font_regular_path,
+                           reuse_previous, on_progress, output_format, preview),
+        _get_io_loop())
+
+def _generate_content(pydantic_model, invoke_params):
     """공통 콘텐츠 생성 로직을 처리하는 헬퍼 함수"""
-    parser = JsonOutputParser(pydantic_object=pydantic_model)
-    chain = prompt_template | llm | parser
+    chain = get_structured_chain(pydantic_model)
     try:
-        invoke_params["format_instructions"] = parser.get_format_instructions()
         return chain.invoke(invoke_params)
     except Exception as e:
         logging.error(f"콘텐츠 생성 중 오류: {e}\n{traceback.format_exc()}")
         return None
     
-def generate_instagram_post(branding_info: BrandingOutput, product_info: dict) -> Optional[Dict[str, Any]]:
-    """전문가 프롬프트를 사용하여 최적화된 인스타그램 포스트 콘텐츠를 생성합니다."""
+def generate_instagram_post(branding_info: BrandingOutput, product_info: dict, use_cache: bool = True) -> Optional[Dict[str, Any]]:
+    """전문가 프롬프트를 사용하여 최적화된 인스타그램 포스트 콘텐츠를 생성합니다. `use_cache=False`이면 LLM 캐시를 건너뜁니다."""
     logging.info("최적화된 인스타그램 포스트 생성을 시작합니다.")
     
-    parser = JsonOutputParser(pydantic_object=InstagramPost)
-    chain = INSTAGRAM_POST_PROMPT | llm | parser
+    chain = get_structured_chain(InstagramPost)
 
     try:
-        post_content = chain.invoke({
-            "branding_info": branding_info.model_dump_json(),
-            "product_info": product_info,
-            "format_instructions": parser.get_format_instructions()
-        })
+        with _llm_cache_scope(use_cache):
+            post_content = chain.invoke({
+                "branding_info": branding_info.model_dump_json(),
+                "product_info": product_info,
+            })
         return post_content
     except Exception as e:
         logging.error(f"인스타그램 포스트 생성 중 오류: {e}\n{traceback.format_exc()}")
         return None
     
-def generate_naver_blog_post(branding_info: BrandingOutput, product_info: dict) -> Optional[Dict[str, Any]]:
-    """전문가 프롬프트를 사용하여 최적화된 네이버 블로그 정보성 포스팅을 생성합니다."""
+def generate_naver_blog_post(branding_info: BrandingOutput, product_info: dict, use_cache: bool = True) -> Optional[Dict[str, Any]]:
+    """전문가 프롬프트를 사용하여 최적화된 네이버 블로그 정보성 포스팅을 생성합니다. `use_cache=False`이면 LLM 캐시를 건너뜁니다."""
     logging.info("최적화된 네이버 블로그 포스팅 생성을 시작합니다.")
     
-    parser = JsonOutputParser(pydantic_object=NaverBlogPost)
-    chain = NAVER_BLOG_PROMPT | llm | parser
+    chain = get_structured_chain(NaverBlogPost)
 
     try:
-        post_content = chain.invoke({
-            "branding_info": branding_info.model_dump_json(),
-            "product_info": product_info,
-            "format_instructions": parser.get_format_instructions()
-        })
+        with _llm_cache_scope(use_cache):
+            post_content = chain.invoke({
+                "branding_info": branding_info.model_dump_json(),
+                "product_info": product_info,
+            })
         return post_content
     except Exception as e:
         logging.error(f"네이버 블로그 포스팅 생성 중 오류: {e}\n{traceback.format_exc()}")
         return None
 
 
-def generate_dalle_image_from_prompt(prompt: str) -> Optional[bytes]:
-    """주어진 프롬프트로 DALL-E 이미지를 생성하고 이미지 데이터를 bytes로 반환합니다."""
+def generate_dalle_image_from_prompt(prompt: str, reuse_previous: bool = False) -> Optional[bytes]:
+    """주어진 프롬프트로 DALL-E 이미지를 생성하고 이미지 데이터를 bytes로 반환합니다.
+
+    `reuse_previous=True`이면 같은 프롬프트로 이전에 생성한 이미지를 로컬 저장소에서 바로 반환합니다.
+    """
     try:
+        generation_options = {
+            "model": "dall-e-3",
+            "size": "1024x1024", # 인스타그램에 적합한 1:1 비율
+            "quality": "hd", # 더 높은 품질의 이미지 요청
+        }
+        store = get_image_store()
+        key = ImageStore.make_key(prompt, **generation_options)
+        if store and reuse_previous:
+            cached = store.get(key)
+            if cached is not None:
+                logging.info("이전에 생성한 DALL-E 이미지를 재사용합니다.")
+                return cached
+
         logging.info(f"DALL-E 이미지 생성 요청: {prompt[:100]}...")
-        response = openai.images.generate(
-            model="dall-e-3",
-            prompt=prompt,
-            n=1,
-            size="1024x1024", # 인스타그램에 적합한 1:1 비율
-            quality="hd" # 더 높은 품질의 이미지 요청
-        )
-        image_url = response.data[0].url
-        image_response = requests.get(image_url)
-        image_response.raise_for_status()
-        return image_response.content
+        response = _images_generate_with_retry(prompt=prompt, n=1, response_format="b64_json", **generation_options)
+        image_data = _image_bytes_from_response(response)
+        if store:
+            try:
+                store.put(key, image_data)
+            except Exception as e:
+                logging.warning(f"생성 이미지 저장 실패: {e}")
+        return image_data
     except Exception as e:
         logging.error(f"DALL-E 이미지 생성 중 오류: {e}")
         return None
     
-    
\ No newline at end of file
+    
@@ -1,9 +1,11 @@
 import streamlit as st
 import api_function as api
-from prompts import BrandingOutput, STORY_INTERVIEW_QUESTIONS, PageTextContent
+from prompts import BrandingOutput, STORY_INTERVIEW_QUESTIONS
 import os
 import av
 import io
+import time
+import wave
 from streamlit_webrtc import webrtc_streamer, WebRtcMode, AudioProcessorBase
 
 # --- 1. 페이지 설정 및 세션 상태 초기화 ---
@@ -23,6 +25,8 @@ def initialize_session_state():
         st.session_state.input_method = 'direct'
     if 'transcribed_text' not in st.session_state:
         st.session_state.transcribed_text = ""
+    if 'transcription_warning' not in st.session_state:
+        st.session_state.transcription_warning = None
 
     # AI 인터뷰 관련 상태
     if 'interview_answers' not in st.session_state:
@@ -50,6 +54,8 @@ def initialize_session_state():
         
     if 'final_detail_page' not in st.session_state:
         st.session_state.final_detail_page = None
+    if 'detail_page_preview' not in st.session_state:
+        st.session_state.detail_page_preview = None
         
     if 'slogan_alternatives' not in st.session_state:
         st.session_state.slogan_alternatives = []
@@ -58,32 +64,73 @@ def initialize_session_state():
 initialize_session_state()
 
 
+@st.cache_resource
+def warm_up_fonts():
+    """프로세스당 한 번, 상세페이지에 쓰이는 폰트들을 미리 로드"""
+    api.warm_font_cache()
+
+warm_up_fonts()
+
+
 # --- 2. 오디오 처리 클래스 (streamlit-webrtc) ---
+# 녹음 최대 길이(초). 이 길이를 넘어서 들어오는 음성은 버립니다.
+MAX_RECORDING_SECONDS = int(os.getenv("MAX_RECORDING_SECONDS", "180"))
+
 class AudioRecorder(AudioProcessorBase):
-    def __init__(self) -> None:
-        self._frames = []
+    """프레임이 들어올 때마다 16kHz s16 mono PCM으로 변환해 버퍼에 쌓아두는 녹음기
+
+    녹음을 마칠 때는 이미 변환된 PCM에 WAV 헤더만 붙이면 되므로, 녹음 길이와 관계없이 종료 비용이 작습니다.
+    """
+    def __init__(self, max_seconds: int = MAX_RECORDING_SECONDS) -> None:
+        self.max_seconds = max_seconds
+        self._resampler = None
+        self._sample_rate = None
+        self._max_bytes = 0
+        self._pcm = bytearray()
+
+    def _append(self, frames) -> None:
+        for resampled in frames:
+            if len(self._pcm) >= self._max_bytes:
+                return
+            self._pcm += resampled.to_ndarray().tobytes()
+
     def recv(self, frame: av.AudioFrame) -> av.AudioFrame:
-        self._frames.append(frame)
+        if self._resampler is None:
+            # Whisper 업로드 형식에 맞춰 녹음 단계에서 바로 16kHz로 다운샘플링
+            self._sample_rate = api.AUDIO_UPLOAD_SAMPLE_RATE
+            self._resampler = av.AudioResampler(format="s16", layout="mono", rate=self._sample_rate)
+            self._max_bytes = self.max_seconds * self._sample_rate * 2 # s16 mono: 샘플당 2바이트
+        self._append(self._resampler.resample(frame))
         return frame
+
     def on_ended(self):
-        if not self._frames:
+        if self._resampler is None:
+            return
+        self._append(self._resampler.resample(None)) # 리샘플러에 남은 샘플 비우기
+        if not self._pcm:
             return
-        sound = self._frames[0]
-        for frame in self._frames[1:]:
-            sound += frame
         buffer = io.BytesIO()
-        output_container = av.open(buffer, mode="w", format="wav")
-        stream = output_container.add_stream("pcm_s16le", rate=sound.sample_rate, layout="mono")
-        for frame in av.AudioResampler(format="s16", layout="mono", rate=sound.sample_rate).resample(sound):
-            for packet in stream.encode(frame):
-                output_container.mux(packet)
-        output_container.close()
-        buffer.seek(0)
-        st.session_state.audio_bytes = buffer.read()
+        with wave.open(buffer, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self._sample_rate)
+            wav_file.writeframes(bytes(self._pcm[:self._max_bytes]))
+        st.session_state.audio_bytes = buffer.getvalue()
 
 
 # --- 3. 단계별 UI 렌더링 함수 ---
 
+def render_progress_event(level: str, message: str, status_placeholder=None):
+    """api 함수가 보낸 진행 상황 이벤트를 Streamlit 메시지로 표시
+
+    `status_placeholder`를 주면 "info" 이벤트(진행 중 안내)는 그 자리에 덮어써서 현재 단계만 보여주고,
+    완료/경고/오류 이벤트는 그대로 남깁니다.
+    """
+    if level == "info" and status_placeholder is not None:
+        status_placeholder.info(message)
+    else:
+        getattr(st, level, st.info)(message)
+
 def show_progress():
     if st.session_state.product_info:
         with st.expander("지금까지 입력한 정보 보기", expanded=False):
@@ -182,6 +229,9 @@ def render_story_step():
 
     # '직접 입력' 모드
     if input_method == 'direct':
+        if st.session_state.transcription_warning:
+            st.warning(st.session_state.transcription_warning)
+            st.session_state.transcription_warning = None
         st.text_area(
             "여기에 상품 이야기를 자유롭게 작성해주세요.",
             value=st.session_state.get('transcribed_text', ''),
@@ -204,10 +254,22 @@ def render_story_step():
         webrtc_streamer(key="webrtc_story", mode=WebRtcMode.SENDONLY, audio_processor_factory=AudioRecorder, media_stream_constraints={"video": False, "audio": True})
         if st.session_state.audio_bytes:
             with st.spinner("음성을 텍스트로 변환하고 있습니다..."):
-                st.session_state.transcribed_text = api.transcribe_audio(st.session_state.audio_bytes) or ""
+                # 긴 답변은 구간별로 나누어 전사하고, 인식된 부분부터 바로 보여줌
+                partial_placeholder = st.empty()
+                progress = None
+                for progress in api.transcribe_audio_chunked(st.session_state.audio_bytes):
+                    partial_placeholder.info(f"지금까지 인식된 내용: {progress.text}")
                 st.session_state.audio_bytes = None
-                st.session_state.input_method = 'direct'
-                st.rerun()
+                if progress is None or progress.all_failed:
+                    partial_placeholder.empty()
+                    st.error("음성 인식 중 오류가 발생했습니다. 다시 시도해주세요.")
+                else:
+                    if progress.failed:
+                        st.session_state.transcription_warning = (
+                            f"음성 {progress.total}개 구간 중 {progress.failed}개를 인식하지 못했습니다. 내용을 확인해주세요.")
+                    st.session_state.transcribed_text = progress.text
+                    st.session_state.input_method = 'direct'
+                    st.rerun()
         if st.button("직접 쓸래요"): st.session_state.input_method = 'direct'; st.rerun()
             
     # 'AI 대화' 모드
@@ -229,7 +291,9 @@ def render_story_step():
                     for i, question in enumerate(STORY_INTERVIEW_QUESTIONS):
                         answer = st.session_state.interview_answers.get(i, "답변 없음")
                         summary += f"Q: {question}\nA: {answer}\n\n"
-                    st.session_state.generated_story_text = api.generate_story_from_interview(summary)
+                    # 생성되는 스토리를 실시간으로 보여주고, 완성된 전체 텍스트를 저장
+                    story = st.write_stream(api.stream_story_from_interview(summary))
+                    st.session_state.generated_story_text = story or None
                     st.rerun()
         if st.button("직접 쓸래요"): st.session_state.input_method = 'direct'; st.rerun()
 
@@ -273,7 +337,16 @@ def render_processing_page():
         st.success("최신 정보 분석 완료!")
 
     with st.spinner("2. 사장님만의 특별한 브랜딩을 만드는 중..."):
-        branding_result = api.generate_branding(st.session_state.product_info, st.session_state.live_local_info)
+        # 브랜딩 결과를 필드가 도착하는 대로 미리 보여줌
+        preview = st.empty()
+        branding_dict = {}
+        for branding_dict in api.stream_branding(st.session_state.product_info, st.session_state.live_local_info):
+            with preview.container():
+                render_branding_preview(branding_dict)
+        try:
+            branding_result = BrandingOutput(**branding_dict) if branding_dict else None
+        except Exception:
+            branding_result = None
         if branding_result:
             st.session_state.branding_result = branding_result
             st.success("브랜딩 생성 완료!")
@@ -285,6 +358,15 @@ def render_processing_page():
     st.session_state.current_step = 'show_results'
     st.rerun()
 
+def render_branding_preview(partial: dict):
+    """스트리밍 중인 브랜딩 결과에서 지금까지 도착한 필드만 보여주는 함수"""
+    labels = [("core_concept", "💡 핵심 컨셉"), ("slogan", "🗣️ 슬로건"), ("introduction", "브랜드 소개"), ("story", "브랜드 스토리")]
+    for key, label in labels:
+        if partial.get(key):
+            st.markdown(f"**{label}**: {partial[key]}")
+    if partial.get("keywords"):
+        st.markdown(" ".join(f"#{kw}" for kw in partial["keywords"] if kw))
+
 def render_results_page():
     st.title("사장님만의 특별한 브랜드가 탄생!")
     st.write("사장님의 소중한 이야기와 저희 AI의 분석을 통해, 세상에 단 하나뿐인 브랜드 컨셉을 만들었습니다.")
@@ -301,23 +383,46 @@ def render_results_page():
         if st.session_state.final_detail_page:
             st.markdown("---")
             st.subheader("✨ 최종 완성된 상세페이지")
-            st.image(st.session_state.final_detail_page, caption="AI가 생성한 최종 상세페이지")
-            st.download_button(label="상세페이지 다운로드", data=st.session_state.final_detail_page, file_name=f"{st.session_state.product_info.get('상품명', 'product')}_상세페이지.png", mime="image/png")
+            # 화면에는 가벼운 미리보기를 보여주고, 다운로드는 원본 화질로 제공
+            st.image(st.session_state.detail_page_preview or st.session_state.final_detail_page, caption="AI가 생성한 최종 상세페이지")
+            mime, extension = api.output_file_info(api.DETAIL_PAGE_OUTPUT_FORMAT)
+            st.download_button(label="상세페이지 다운로드", data=st.session_state.final_detail_page, file_name=f"{st.session_state.product_info.get('상품명', 'product')}_상세페이지.{extension}", mime=mime)
             st.markdown("---")
 
         button_text = "상세페이지 다시 생성 및 조립하기" if st.session_state.final_detail_page else "🎨 상세페이지 생성 및 조립하기"
+        reuse_image = st.checkbox("이전에 생성한 상품 이미지 재사용하기", value=False, key="reuse_detail_image",
+                                  help="같은 상품으로 만든 이미지가 있으면 DALL-E를 다시 호출하지 않아 더 빠르고 비용이 들지 않습니다.")
         
         if st.button(button_text, type="primary"):
             st.session_state.final_detail_page = None # 다시 생성 시 기존 이미지 초기화
+            st.session_state.detail_page_preview = None
             result_container = st.container(border=True)
             
             with result_container:
                 st.subheader("상세페이지 생성 과정")
 
-            # 1. 텍스트 생성 및 표시
-            with st.spinner("1/3 - 텍스트 콘텐츠 생성 중..."):
-                page_texts_dict = api.generate_page_texts(st.session_state.product_info, st.session_state.branding_result, st.session_state.live_local_info)
-            
+            # 텍스트와 이미지를 동시에 생성한 뒤 최종 조립
+            with st.spinner("텍스트 콘텐츠와 DALL-E 이미지를 동시에 생성하고 조립하는 중..."):
+                font_path = os.path.join(os.path.dirname(__file__), "fonts", "나눔손글씨_성실체.ttf")
+                progress_events = api.ProgressEventQueue()
+                future = api.submit_detail_page(
+                    st.session_state.product_info, st.session_state.branding_result,
+                    st.session_state.live_local_info, font_path, font_path,
+                    reuse_previous=reuse_image, on_progress=progress_events, preview=True
+                )
+                # 생성이 끝날 때까지 워커 스레드의 진행 상황 메시지를 메인 스레드에서 바로 표시
+                status_placeholder = st.empty()
+                while True:
+                    done = future.done()
+                    for level, message in progress_events.drain():
+                        render_progress_event(level, message, status_placeholder)
+                    if done:
+                        break
+                    time.sleep(0.2)
+                status_placeholder.empty()
+                page_texts_dict, product_image, final_image_buffer, preview_image = future.result()
+
+            # 1. 텍스트 생성 결과 표시
             if page_texts_dict:
                 with result_container:
                     st.write("**1단계: 텍스트 생성 완료**")
@@ -327,26 +432,19 @@ def render_results_page():
                 st.error("텍스트 콘텐츠 생성에 실패했습니다.")
                 return
 
-            # 2. 이미지 생성 및 표시
-            with st.spinner("2/3 - DALL-E 이미지 생성 중..."):
-                image_url = api.generate_product_image(st.session_state.product_info)
-
-            if image_url:
+            # 2. 이미지 생성 결과 표시
+            if product_image:
                 with result_container:
                     st.write("**2단계: DALL-E 원본 이미지 생성 완료**")
-                    st.image(image_url, caption="텍스트가 추가되기 전의 원본 이미지입니다.")
+                    st.image(product_image, caption="텍스트가 추가되기 전의 원본 이미지입니다.")
             else:
                 st.error("DALL-E 이미지 생성에 실패했습니다.")
                 return
 
-            # 3. 최종 조립 및 표시
-            with st.spinner("3/3 - 최종 이미지 조립 중..."):
-                page_texts_object = PageTextContent(**page_texts_dict)
-                font_path = os.path.join(os.path.dirname(__file__), "fonts", "나눔손글씨_성실체.ttf")
-                final_image_buffer = api.compose_final_image(page_texts_object, image_url, font_path, font_path)
-            
+            # 3. 최종 조립 결과
             if final_image_buffer:
                 st.session_state.final_detail_page = final_image_buffer.getvalue()
+                st.session_state.detail_page_preview = preview_image
                 st.success("상세페이지 조립이 완료되었습니다!")
                 st.rerun()
             else:
@@ -372,16 +470,19 @@ def render_instagram_creator_ui():
     st.subheader("📸 AI 인스타그램 포스트")
     st.write("AI 마케팅 전문가가 사장님의 브랜딩에 맞춰 최고의 인스타그램 게시물을 생성합니다.")
 
+    reuse_image = st.checkbox("같은 이미지 프롬프트면 이전 이미지 재사용하기", value=False, key="reuse_insta_image")
     if st.button("✨ 최적화된 인스타그램 게시물 생성하기", type="primary", use_container_width=True):
         content_key = 'instagram_post'
+        # 이미 만든 게시물이 있으면 "다시 생성"이므로 LLM 캐시를 건너뜀
+        use_cache = not st.session_state.marketing_content.get(content_key)
         st.session_state.marketing_content[content_key] = None
         
         with st.spinner("AI 인스타그램 전문가가 콘텐츠를 제작하고 있습니다..."):
-            post_data = api.generate_instagram_post(st.session_state.branding_result, st.session_state.product_info)
+            post_data = api.generate_instagram_post(st.session_state.branding_result, st.session_state.product_info, use_cache=use_cache)
         
         if post_data:
             with st.spinner("콘텐츠에 맞는 이미지를 DALL-E로 생성 중입니다..."):
-                image_bytes = api.generate_dalle_image_from_prompt(post_data.get('image_prompt'))
+                image_bytes = api.generate_dalle_image_from_prompt(post_data.get('image_prompt'), reuse_previous=reuse_image)
             if image_bytes:
                 st.session_state.marketing_content[content_key] = {"image": image_bytes, "post_text": post_data.get('post_text'), "hashtags": post_data.get('hashtags')}
                 st.success("인스타그램 게시물 생성이 완료되었습니다!")
@@ -423,10 +524,12 @@ def render_naver_blog_creator_ui():
 
     if st.button("✨ 정보성 블로그 포스팅 생성하기", type="primary", use_container_width=True):
         content_key = 'naver_blog_post'
+        # 이미 만든 포스팅이 있으면 "다시 생성"이므로 LLM 캐시를 건너뜀
+        use_cache = not st.session_state.marketing_content.get(content_key)
         st.session_state.marketing_content[content_key] = None
         
         with st.spinner("AI 전문가가 블로그 포스팅을 작성하고 있습니다..."):
-            post_data = api.generate_naver_blog_post(st.session_state.branding_result, st.session_state.product_info)
+            post_data = api.generate_naver_blog_post(st.session_state.branding_result, st.session_state.product_info, use_cache=use_cache)
         
         if post_data:
             st.session_state.marketing_content[content_key] = post_data
@@ -491,7 +594,8 @@ def render_branding_concept_cards():
             with st.spinner("새로운 슬로건을 구상하고 있습니다..."):
                 alternatives = api.regenerate_slogan(
                     core_concept=b.core_concept,
-                    original_slogan=b.slogan
+                    original_slogan=b.slogan,
+                    use_cache=False
                 )
                 st.session_state.slogan_alternatives = alternatives
                 st.rerun()
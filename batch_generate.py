@@ -0,0 +1,241 @@
+"""상품 목록(JSONL)으로 브랜딩 패키지를 일괄 생성하는 배치 스크립트
+
+입력 파일의 각 줄은 하나의 상품 레코드입니다.
+    {"id": "apple-01", "상품명": "햇살담은 영천 사과", "원산지": "경북 영천", "판매자 스토리": "...", "품목": "과일"}
+`id`가 없으면 상품 정보로 만든 해시를 사용하며, `품목` 대신 `category`를 써도 됩니다.
+
+레코드마다 웹 리서치 → 브랜딩 → 상세페이지 텍스트/이미지 생성 → 최종 조립을 수행하고,
+결과를 `<출력 폴더>/<id>/`에 저장합니다. 완료된 레코드는 result.json이 남으므로,
+중단 후 다시 실행하면 끝난 레코드는 건너뛰고 나머지만 처리합니다.
+
+사용법:
+    python batch_generate.py products.jsonl --output-dir batch_output --workers 4
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Tuple
+
+import api_function as api
+
+RESULT_FILENAME = "result.json"
+SUMMARY_FILENAME = "summary.json"
+
+# 입력 레코드 키 → 앱에서 사용하는 product_info 키
+FIELD_ALIASES = {
+    "상품명": "상품명",
+    "product_name": "상품명",
+    "원산지": "원산지",
+    "origin": "원산지",
+    "판매자 스토리": "판매자 스토리",
+    "seller_story": "판매자 스토리",
+    "품목": "품목",
+    "category": "품목",
+    "원하는 브랜드 이미지": "원하는 브랜드 이미지",
+    "desired_brand_image": "원하는 브랜드 이미지",
+}
+REQUIRED_FIELDS = ("상품명", "원산지")
+
+
+def load_records(path: str) -> List[Tuple[str, Dict[str, str]]]:
+    """JSONL 파일을 읽어 (레코드 id, product_info) 목록을 반환합니다. 잘못된 줄은 건너뜁니다.
+
+    같은 내용의 레코드가 여러 번 나오면 한 번만 처리합니다. 서로 다른 레코드가 같은 폴더 이름(id)이 되면
+    (예: `a/b`와 `a_b`) 뒤에 나온 레코드의 id에 내용 해시를 붙여 폴더가 겹치지 않게 합니다.
+    """
+    records = []
+    seen: Dict[str, Dict[str, str]] = {}  # 폴더 이름(소문자) -> product_info
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                raw = json.loads(line)
+            except json.JSONDecodeError as e:
+                logging.warning(f"{line_number}번째 줄을 읽을 수 없어 건너뜁니다: {e}")
+                continue
+            if not isinstance(raw, dict):
+                logging.warning(f"{line_number}번째 줄이 JSON 객체가 아니어서 건너뜁니다.")
+                continue
+
+            product_info = {FIELD_ALIASES[key]: str(value) for key, value in raw.items() if key in FIELD_ALIASES and value}
+            missing = [field for field in REQUIRED_FIELDS if field not in product_info]
+            if missing:
+                logging.warning(f"{line_number}번째 줄에 필수 항목 {missing}이 없어 건너뜁니다.")
+                continue
+
+            record_id = _record_id(raw, product_info)
+            previous = seen.get(record_id.lower())
+            if previous == product_info:
+                logging.warning(f"{line_number}번째 줄은 이미 읽은 레코드({record_id})와 같아 건너뜁니다.")
+                continue
+            if previous is not None:
+                new_id = f"{record_id}-{_content_digest([raw.get('id'), product_info])[:8]}"
+                logging.warning(f"{line_number}번째 줄의 id가 다른 레코드와 같은 폴더({record_id})가 되어 {new_id}로 바꿉니다.")
+                record_id = new_id
+            seen[record_id.lower()] = product_info
+            records.append((record_id, product_info))
+    return records
+
+
+def _content_digest(data: Any) -> str:
+    return hashlib.sha1(json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _record_id(raw: Dict[str, Any], product_info: Dict[str, str]) -> str:
+    if raw.get("id"):
+        # 폴더 이름으로 쓸 수 없는 문자는 '_'로 바꾸고, '.'/'..'처럼 상위 폴더를 가리키지 않도록 앞의 '.'을 지움
+        record_id = re.sub(r"[^\w.-]", "_", str(raw["id"])).lstrip(".")
+        if record_id and record_id != SUMMARY_FILENAME:
+            return record_id
+        logging.warning(f"id {raw['id']!r}는 폴더 이름으로 쓸 수 없어 내용 해시를 사용합니다.")
+    return _content_digest(product_info)[:12]
+
+
+def _record_dir(output_dir: str, record_id: str) -> str:
+    """레코드 결과 폴더 경로를 반환합니다. 경로가 `output_dir` 밖을 가리키면 ValueError를 발생시킵니다."""
+    root = os.path.abspath(output_dir)
+    record_dir = os.path.abspath(os.path.join(root, record_id))
+    if record_dir == root or os.path.commonpath([root, record_dir]) != root:
+        raise ValueError(f"레코드 id {record_id!r}의 결과 폴더가 출력 폴더 밖을 가리킵니다.")
+    return record_dir
+
+
+def is_completed(record_dir: str) -> bool:
+    """이전 실행에서 이미 성공적으로 끝난 레코드인지 확인합니다."""
+    try:
+        with open(os.path.join(record_dir, RESULT_FILENAME), encoding="utf-8") as f:
+            return json.load(f).get("status") == "ok"
+    except (OSError, json.JSONDecodeError):
+        return False
+
+
+def _write_json(path: str, data: Any) -> None:
+    # 중간에 종료되어도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def process_record(record_id: str, product_info: Dict[str, str], output_dir: str,
+                   font_bold_path: str, font_regular_path: str) -> Dict[str, Any]:
+    """레코드 하나에 대해 브랜딩 패키지를 생성하고 결과 요약(dict)을 반환합니다."""
+    record_dir = _record_dir(output_dir, record_id)
+    os.makedirs(record_dir, exist_ok=True)
+    timings = {}
+    result = {"id": record_id, "product_info": product_info, "status": "failed", "timings": timings}
+
+    def on_progress(level: str, message: str) -> None:
+        api.log_progress(level, f"[{record_id}] {message}")
+
+    start = time.perf_counter()
+    try:
+        step_start = time.perf_counter()
+        live_local_info, queries = api.search_with_tavily_multi_query(product_info)
+        timings["research"] = time.perf_counter() - step_start
+        with open(os.path.join(record_dir, "research.md"), "w", encoding="utf-8") as f:
+            f.write("\n".join(f"# {query}" for query in queries) + "\n\n" + live_local_info)
+
+        step_start = time.perf_counter()
+        branding = api.generate_branding(product_info, live_local_info)
+        timings["branding"] = time.perf_counter() - step_start
+        if branding is None:
+            result["error"] = "브랜딩 생성 실패"
+            return result
+        _write_json(os.path.join(record_dir, "branding.json"), branding.model_dump())
+
+        step_start = time.perf_counter()
+        page_texts, _, final_image, _ = api.build_detail_page(
+            product_info, branding, live_local_info, font_bold_path, font_regular_path,
+            on_progress=on_progress,
+        )
+        timings["detail_page"] = time.perf_counter() - step_start
+        if page_texts:
+            _write_json(os.path.join(record_dir, "page_texts.json"), page_texts)
+        if final_image is None:
+            result["error"] = "상세페이지 생성 실패"
+            return result
+        _, extension = api.output_file_info(api.DETAIL_PAGE_OUTPUT_FORMAT)
+        with open(os.path.join(record_dir, f"detail_page.{extension}"), "wb") as f:
+            f.write(final_image.getvalue())
+
+        result["status"] = "ok"
+        return result
+    except Exception as e:
+        logging.error(f"[{record_id}] 처리 중 오류 발생: {e}")
+        result["error"] = str(e)
+        return result
+    finally:
+        timings["total"] = time.perf_counter() - start
+        _write_json(os.path.join(record_dir, RESULT_FILENAME), result)
+
+
+def run_batch(input_path: str, output_dir: str, workers: int, font_bold_path: str, font_regular_path: str) -> Dict[str, Any]:
+    """입력 파일의 모든 레코드를 처리하고, 처리량 요약을 반환합니다."""
+    records = load_records(input_path)
+    os.makedirs(output_dir, exist_ok=True)
+
+    pending = [(record_id, info) for record_id, info in records
+               if not is_completed(_record_dir(output_dir, record_id))]
+    skipped = len(records) - len(pending)
+    if skipped:
+        logging.info(f"이전 실행에서 완료된 {skipped}개 레코드는 건너뜁니다.")
+
+    results = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="batch") as executor:
+        futures = [executor.submit(process_record, record_id, info, output_dir, font_bold_path, font_regular_path)
+                   for record_id, info in pending]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            logging.info(f"[{len(results)}/{len(pending)}] {result['id']}: {result['status']} "
+                         f"({result['timings'].get('total', 0):.1f}s)")
+    elapsed = time.perf_counter() - start
+
+    succeeded = sum(1 for r in results if r["status"] == "ok")
+    summary = {
+        "total": len(records),
+        "processed": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "skipped": skipped,
+        "elapsed_seconds": round(elapsed, 2),
+        "records_per_minute": round(len(results) / elapsed * 60, 2) if elapsed > 0 else 0.0,
+        "avg_seconds_per_record": round(sum(r["timings"].get("total", 0) for r in results) / len(results), 2) if results else 0.0,
+        "failed_ids": sorted(r["id"] for r in results if r["status"] != "ok"),
+    }
+    _write_json(os.path.join(output_dir, SUMMARY_FILENAME), summary)
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="상품 JSONL로 브랜딩 패키지를 일괄 생성합니다.")
+    parser.add_argument("input", help="상품 레코드 JSONL 파일")
+    parser.add_argument("--output-dir", default="batch_output", help="결과를 저장할 폴더")
+    parser.add_argument("--workers", type=int, default=2, help="동시에 처리할 레코드 수")
+    parser.add_argument("--font-bold", default=api.FONT_PATH, help="제목용 폰트 경로")
+    parser.add_argument("--font-regular", default=api.FONT_PATH, help="본문용 폰트 경로")
+    args = parser.parse_args()
+
+    summary = run_batch(args.input, args.output_dir, args.workers, args.font_bold, args.font_regular)
+    api.wait_for_background_tasks()  # 벡터 인덱스 추가가 끝나기 전에 종료하지 않도록 대기
+    print(f"\n총 {summary['total']}개 중 처리 {summary['processed']}개 "
+          f"(성공 {summary['succeeded']}, 실패 {summary['failed']}, 건너뜀 {summary['skipped']})")
+    print(f"소요 시간 {summary['elapsed_seconds']}초, 처리량 {summary['records_per_minute']}개/분, "
+          f"레코드당 평균 {summary['avg_seconds_per_record']}초")
+    if summary["failed_ids"]:
+        print(f"실패한 레코드: {', '.join(summary['failed_ids'])} (다시 실행하면 이 레코드만 재시도합니다)")
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""모듈 import 시간 측정 스크립트
+
+새 프로세스에서 `python -X importtime -c "import <module>"`을 여러 번 실행해 import 시간을 측정하고,
+누적 시간이 큰 하위 모듈을 함께 보여줍니다.
+
+사용법:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --module api_function --runs 10 --max-ms 400
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[str, int]]:
+    """`-X importtime` 출력에서 (모듈 이름, 누적 시간 us) 목록을 추출합니다."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        entries.append((name.strip(), int(cumulative)))
+    return entries
+
+
+def measure_once(module: str) -> Tuple[float, Dict[str, int]]:
+    """새 인터프리터에서 모듈을 한 번 import하고 (총 import 시간 ms, 모듈별 누적 시간 us)를 반환합니다."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    entries = dict(_parse_importtime(result.stderr))
+    return entries.get(module, 0) / 1000, entries
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="모듈 import 시간 측정")
+    parser.add_argument("--module", default="api_function")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="누적 시간이 큰 하위 모듈을 몇 개 보여줄지")
+    parser.add_argument("--max-ms", type=float, default=None, help="중앙값이 이 값을 넘으면 종료 코드 1로 실패")
+    args = parser.parse_args()
+
+    timings = []
+    last_entries: Dict[str, int] = {}
+    for _ in range(args.runs):
+        elapsed_ms, last_entries = measure_once(args.module)
+        timings.append(elapsed_ms)
+
+    median_ms = statistics.median(timings)
+    print(f"import {args.module}: median {median_ms:.1f}ms, min {min(timings):.1f}ms, max {max(timings):.1f}ms ({args.runs}회)")
+    print(f"\n누적 시간 상위 {args.top}개 모듈 (마지막 실행 기준):")
+    heaviest = sorted(((name, us) for name, us in last_entries.items() if name != args.module),
+                      key=lambda item: item[1], reverse=True)[:args.top]
+    for name, us in heaviest:
+        print(f"  {us / 1000:8.1f}ms  {name}")
+
+    if args.max_ms is not None and median_ms > args.max_ms:
+        print(f"\n실패: 중앙값 {median_ms:.1f}ms가 기준 {args.max_ms:.1f}ms를 넘었습니다.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Tavily 스니펫 중복 제거 벤치마크
+
+고정 데이터(benchmarks/fixtures/tavily_responses.json)로 기존 방식(content 문자열 완전 일치)과
+SimHash 근접 중복 제거를 비교합니다. 해밍 거리 임계값별로 제거된 스니펫 수, 표시된 중복 그룹 대비
+정밀도/재현율, 프롬프트 토큰 수, 처리 시간을 출력합니다.
+
+사용법:
+    python benchmarks/bench_near_dedup.py
+    python benchmarks/bench_near_dedup.py --thresholds 4 8 12 16 --runs 200
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Any, Set, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from context_compaction import count_tokens  # noqa: E402
+from near_dedup import cluster_near_duplicates, NEAR_DUP_MAX_DISTANCE  # noqa: E402
+
+DEFAULT_FIXTURE = os.path.join(REPO_ROOT, "benchmarks", "fixtures", "tavily_responses.json")
+
+
+def load_snippets(path: str) -> Tuple[List[Dict[str, Any]], List[List[str]]]:
+    """고정 데이터에서 (content 완전 일치 중복을 제거한 스니펫 목록, 표시된 근접 중복 그룹)을 읽습니다."""
+    with open(path, encoding="utf-8") as f:
+        fixture = json.load(f)
+    snippets, seen = [], set()
+    for response in fixture["responses"]:
+        for result in response["results"]:
+            if result["content"] not in seen:
+                seen.add(result["content"])
+                snippets.append(result)
+    return snippets, fixture.get("near_duplicate_groups", [])
+
+
+def _duplicate_pairs(clusters: List[List[str]]) -> Set[Tuple[str, str]]:
+    pairs = set()
+    for cluster in clusters:
+        for i, a in enumerate(cluster):
+            for b in cluster[i + 1:]:
+                pairs.add(tuple(sorted((a, b))))
+    return pairs
+
+
+def _prompt_tokens(snippets: List[Dict[str, Any]]) -> int:
+    return count_tokens("".join(f"- {s['title']}: {s['content']}\n" for s in snippets))
+
+
+def run(snippets: List[Dict[str, Any]], groups: List[List[str]], max_distance: int, runs: int) -> Dict[str, Any]:
+    texts = [s["content"] for s in snippets]
+    scores = [s["score"] for s in snippets]
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        clusters = cluster_near_duplicates(texts, scores, max_distance)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    kept = [snippets[cluster[0]] for cluster in clusters]
+    predicted = _duplicate_pairs([[snippets[i]["url"] for i in cluster] for cluster in clusters])
+    expected = _duplicate_pairs(groups)
+    true_positive = len(predicted & expected)
+    # 각 클러스터에서 남긴 스니펫이 그 클러스터의 최고 점수인지 확인
+    best_kept = all(snippets[cluster[0]]["score"] == max(snippets[i]["score"] for i in cluster) for cluster in clusters)
+    return {
+        "kept": len(kept),
+        "removed": len(snippets) - len(kept),
+        "precision": true_positive / len(predicted) if predicted else 1.0,
+        "recall": true_positive / len(expected) if expected else 1.0,
+        "tokens": _prompt_tokens(kept),
+        "median_ms": statistics.median(timings),
+        "best_kept": best_kept,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Tavily 스니펫 근접 중복 제거 벤치마크")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE)
+    parser.add_argument("--thresholds", type=int, nargs="+", default=[0, 4, 8, NEAR_DUP_MAX_DISTANCE, 16, 20])
+    parser.add_argument("--runs", type=int, default=100)
+    args = parser.parse_args()
+
+    snippets, groups = load_snippets(args.fixture)
+    print(f"스니펫 {len(snippets)}개 (content 완전 일치 중복 제거 후), 표시된 근접 중복 그룹 {len(groups)}개")
+    print(f"기존 방식(완전 일치만 제거): 프롬프트 {_prompt_tokens(snippets)} 토큰\n")
+
+    print(f"{'거리':>4} {'남김':>4} {'제거':>4} {'정밀도':>6} {'재현율':>6} {'토큰':>6} {'중앙값(ms)':>10}  최고점수 유지")
+    for max_distance in args.thresholds:
+        result = run(snippets, groups, max_distance, args.runs)
+        marker = " (기본값)" if max_distance == NEAR_DUP_MAX_DISTANCE else ""
+        print(f"{max_distance:>4} {result['kept']:>4} {result['removed']:>4} {result['precision']:>6.2f} "
+              f"{result['recall']:>6.2f} {result['tokens']:>6} {result['median_ms']:>10.2f}  "
+              f"{'예' if result['best_kept'] else '아니오'}{marker}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""상세페이지 출력 인코딩 벤치마크
+
+상세페이지와 같은 크기(1080x1500)의 합성 이미지(사진처럼 노이즈가 섞인 그라디언트 + 단색 텍스트 박스)를
+OUTPUT_ENCODINGS의 각 설정으로 인코딩해 용량과 인코딩 시간을 비교합니다. 화면 표시용 미리보기도 함께 측정합니다.
+
+사용법:
+    python benchmarks/bench_output_encoding.py
+    python benchmarks/bench_output_encoding.py --runs 10 --encodings png png_fast jpeg
+"""
+import argparse
+import os
+import statistics
+import sys
+from typing import Any, Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+from PIL import Image, ImageDraw  # noqa: E402
+
+import api_function as api  # noqa: E402
+
+CANVAS_SIZE = (1080, 1500)
+
+
+def make_synthetic_page(seed: int = 0) -> Image.Image:
+    """DALL-E 사진과 비슷하게 노이즈가 섞인 그라디언트 위에 단색 박스를 올린 캔버스를 만듭니다."""
+    rng = np.random.default_rng(seed)
+    width, height = CANVAS_SIZE
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    base = np.stack([x / width * 200, y / height * 180, (x + y) / (width + height) * 220], axis=-1)
+    noise = rng.normal(0, 12, size=base.shape)
+    canvas = Image.fromarray(np.clip(base + noise + 20, 0, 255).astype(np.uint8), "RGB")
+
+    draw = ImageDraw.Draw(canvas)
+    draw.rectangle((0, 0, width, 340), fill=(255, 255, 255))
+    for i, color in enumerate([(255, 243, 224), (232, 245, 233), (227, 242, 253)]):
+        top = 420 + i * 245
+        draw.rounded_rectangle((560, top, width - 33, top + 200), radius=30, fill=color)
+        for line in range(5):
+            draw.text((590, top + 25 + line * 32), "상세페이지 본문 텍스트 " * 2, fill=(40, 40, 40))
+    draw.rectangle((0, 1250, width, height), fill=(255, 255, 255))
+    return canvas
+
+
+def run(image: Image.Image, encoding: str, runs: int) -> Dict[str, Any]:
+    timings: List[float] = []
+    for _ in range(runs):
+        data, report = api.encode_image(image, encoding)
+        timings.append(report["encode_ms"])
+    return {"bytes": len(data), "median_ms": statistics.median(timings)}
+
+
+def run_preview(image: Image.Image, runs: int) -> Dict[str, Any]:
+    timings: List[float] = []
+    for _ in range(runs):
+        data, report = api.make_preview(image)
+        timings.append(report["encode_ms"])
+    return {"bytes": len(data), "median_ms": statistics.median(timings), "size": report["size"]}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="상세페이지 출력 인코딩 벤치마크")
+    parser.add_argument("--encodings", nargs="+", default=list(api.OUTPUT_ENCODINGS))
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    image = make_synthetic_page()
+    print(f"합성 상세페이지 {image.width}x{image.height}, 인코딩별 {args.runs}회 측정 (중앙값)\n")
+
+    baseline = run(image, "png", args.runs)
+    print(f"{'인코딩':<10} {'용량(KB)':>9} {'PNG 대비':>8} {'시간(ms)':>9}")
+    for encoding in args.encodings:
+        result = baseline if encoding == "png" else run(image, encoding, args.runs)
+        marker = " (기본값)" if encoding == api.DETAIL_PAGE_OUTPUT_FORMAT else ""
+        print(f"{encoding:<10} {result['bytes'] / 1024:>9.1f} {result['bytes'] / baseline['bytes']:>8.0%} "
+              f"{result['median_ms']:>9.1f}{marker}")
+
+    preview = run_preview(image, args.runs)
+    print(f"\n미리보기 ({api.DETAIL_PAGE_PREVIEW_FORMAT}, 배율 {api.DETAIL_PAGE_PREVIEW_SCALE}, "
+          f"{preview['size'][0]}x{preview['size'][1]}): {preview['bytes'] / 1024:.1f}KB, "
+          f"{preview['median_ms']:.1f}ms (축소 시간 제외)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
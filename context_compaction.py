@@ -0,0 +1,134 @@
+import logging
+from functools import lru_cache
+from typing import Dict, List, Any, Tuple
+
+from text_normalize import normalize_text
+
+# 토큰 수를 셀 때 사용하는 인코딩 (gpt-4o 계열)
+TOKEN_ENCODING = "o200k_base"
+# 예산이 이만큼 이상 남아 있을 때만 다음 스니펫을 잘라서라도 넣음
+MIN_TRUNCATED_TOKENS = 40
+# 잘라낸 스니펫 끝에 붙이는 표시
+ELLIPSIS = "…"
+
+
+@lru_cache(maxsize=None)
+def _get_encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception as e:
+        logging.warning(f"tiktoken을 사용할 수 없어 토큰 수를 글자 수로 추정합니다: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """텍스트의 토큰 수를 반환합니다. tiktoken이 없으면 글자 수로 추정합니다 (한글 1글자 ≈ 1토큰, 영문 4글자 ≈ 1토큰)."""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return (len(text) - ascii_chars) + (ascii_chars + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """텍스트를 `max_tokens` 토큰 이하로 자릅니다. 가능하면 문장 경계에서 자르고 말줄임표를 붙입니다.
+
+    말줄임표의 토큰도 `max_tokens` 안에 포함됩니다.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    max_tokens -= count_tokens(ELLIPSIS)
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is not None:
+        truncated = encoding.decode(encoding.encode(text)[:max_tokens])
+    else:
+        truncated = text
+        while truncated and count_tokens(truncated) > max_tokens:
+            truncated = truncated[:int(len(truncated) * 0.9)]
+    # 문장 중간에서 끊기지 않도록 마지막 문장 부호까지만 남김 (너무 많이 버리게 되면 그대로 사용)
+    boundary = max(truncated.rfind(mark) for mark in (". ", "다.", "요.", "! ", "? "))
+    if boundary > len(truncated) // 2:
+        truncated = truncated[:boundary + 2]
+    return truncated.rstrip() + ELLIPSIS
+
+
+def relevance_terms(product_info: Dict[str, Any]) -> List[str]:
+    """상품 정보에서 관련도 계산에 사용할 단어(상품명, 핵심상품명, 원산지)를 뽑습니다."""
+    terms = []
+    for field in ("핵심상품명", "상품명", "원산지"):
+        for word in normalize_text(str(product_info.get(field, "")), lowercase=True).split():
+            if len(word) >= 2 and word not in terms:
+                terms.append(word)
+    return terms
+
+
+def score_snippet(snippet: Dict[str, Any], terms: List[str]) -> float:
+    """스니펫의 관련도 점수를 계산합니다. Tavily 점수(0~1)에 상품/지역 단어가 등장한 비율을 더합니다."""
+    text = normalize_text(f"{snippet.get('title', '')} {snippet.get('content', '')}", lowercase=True)
+    term_ratio = sum(1 for term in terms if term in text) / len(terms) if terms else 0.0
+    return float(snippet.get("score") or 0.0) + term_ratio
+
+
+def _format_snippet(snippet: Dict[str, Any], content: str) -> str:
+    return f"- {snippet.get('title', '')}: {content}\n"
+
+
+def compact_research_context(snippets: List[Dict[str, Any]], product_info: Dict[str, Any],
+                             token_budget: int) -> Tuple[str, Dict[str, Any]]:
+    """웹 검색 스니펫을 프롬프트에 넣을 `live_local_info` 문자열로 압축합니다.
+
+    1. 상품명/원산지와의 관련도 순으로 정렬
+    2. 토큰 예산(`token_budget`) 안에 들어가는 만큼 담고, 마지막 스니펫은 필요하면 잘라서 넣음
+
+    근접 중복 제거는 하지 않습니다. 스니펫을 모으는 단계(api_function.acollect_research_snippets)에서
+    Tavily 점수 기준으로 이미 한 번 처리된 스니펫을 받는다고 가정합니다.
+
+    반환값은 (압축된 문자열, 보고서 dict)이며, 보고서에는 원본/압축 후 토큰 수와 절약한 토큰 수가 들어 있습니다.
+    `token_budget`이 0 이하이면 예산 제한 없이 정렬만 합니다.
+    """
+    original_text = "".join(_format_snippet(s, s.get("content", "")) for s in snippets)
+    original_tokens = count_tokens(original_text)
+
+    terms = relevance_terms(product_info)
+    ranked = sorted(snippets, key=lambda s: score_snippet(s, terms), reverse=True)
+
+    lines: List[str] = []
+    used_tokens = 0
+    truncated = 0
+    for snippet in ranked:
+        line = _format_snippet(snippet, snippet.get("content", ""))
+        line_tokens = count_tokens(line)
+        if token_budget <= 0 or used_tokens + line_tokens <= token_budget:
+            lines.append(line)
+            used_tokens += line_tokens
+            continue
+        remaining = token_budget - used_tokens - count_tokens(_format_snippet(snippet, ""))
+        if remaining >= MIN_TRUNCATED_TOKENS:
+            line = _format_snippet(snippet, truncate_to_tokens(snippet.get("content", ""), remaining))
+            lines.append(line)
+            used_tokens += count_tokens(line)
+            truncated += 1
+        break
+
+    compacted = "".join(lines)
+    compacted_tokens = count_tokens(compacted)
+    # 줄을 이어 붙이면 토큰 경계가 달라질 수 있으므로, 합친 결과가 예산을 넘으면 마지막 줄부터 뺌
+    while token_budget > 0 and lines and compacted_tokens > token_budget:
+        lines.pop()
+        truncated = 0  # 잘라서 넣은 줄은 항상 마지막 줄
+        compacted = "".join(lines)
+        compacted_tokens = count_tokens(compacted)
+    assert token_budget <= 0 or compacted_tokens <= token_budget
+    report = {
+        "snippets_in": len(snippets),
+        "snippets_out": len(lines),
+        "truncated": truncated,
+        "original_tokens": original_tokens,
+        "compacted_tokens": compacted_tokens,
+        "tokens_saved": original_tokens - compacted_tokens,
+        "token_budget": token_budget,
+    }
+    return compacted, report
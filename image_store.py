@@ -0,0 +1,98 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional, List, Tuple
+
+
+class ImageStore:
+    """생성된 이미지를 프롬프트 해시로 저장하는 로컬 콘텐츠 주소(content-addressed) 저장소
+
+    - 키: 프롬프트 + 모델/크기/품질을 합친 SHA-256 해시
+    - 용량: 저장된 파일의 총 크기가 `max_bytes`를 넘으면 가장 오래 사용되지 않은 파일부터 삭제 (LRU)
+    """
+
+    def __init__(self, root_dir: str, max_bytes: int = 500 * 1024 * 1024):
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(root_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(prompt: str, model: str, size: str, quality: str) -> str:
+        """프롬프트와 생성 옵션으로 이미지 키(해시)를 만듭니다."""
+        payload = json.dumps({"prompt": prompt, "model": model, "size": size, "quality": quality},
+                             sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        # 한 폴더에 파일이 몰리지 않도록 해시 앞 두 글자로 하위 폴더를 나눔
+        return os.path.join(self.root_dir, key[:2], f"{key}.png")
+
+    def get_path(self, key: str) -> Optional[str]:
+        """저장된 이미지의 파일 경로를 반환합니다. 없으면 None을 반환합니다."""
+        path = self.path_for(key)
+        if not os.path.isfile(path):
+            return None
+        # LRU 정리를 위해 마지막 사용 시각을 갱신
+        now = time.time()
+        os.utime(path, (now, now))
+        return path
+
+    def get(self, key: str) -> Optional[bytes]:
+        """저장된 이미지 데이터를 반환합니다. 없으면 None을 반환합니다."""
+        path = self.get_path(key)
+        if path is None:
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def put(self, key: str, data: bytes) -> str:
+        """이미지 데이터를 저장하고 파일 경로를 반환합니다."""
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 동시에 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._evict_locked()
+        return path
+
+    def _list_files(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root_dir):
+            for filename in filenames:
+                if not filename.endswith(".png"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict_locked(self) -> None:
+        entries = self._list_files()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except FileNotFoundError:
+                continue
+        logging.info(f"이미지 저장소 용량 초과로 {removed}개 파일을 정리했습니다.")
+
+    def total_bytes(self) -> int:
+        """현재 저장된 이미지들의 총 크기(bytes)를 반환합니다."""
+        return sum(size for _, size, _ in self._list_files())
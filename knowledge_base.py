@@ -0,0 +1,76 @@
+import gzip
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from research_cache import normalize_query
+
+# 파일 구조가 바뀌면 올림 (다른 버전의 파일은 읽지 않음)
+FORMAT_VERSION = 1
+
+
+def make_key(region: str, product: str) -> str:
+    """(원산지, 상품) 쌍의 조회 키를 만듭니다. 띄어쓰기/대소문자 차이는 같은 키로 취급합니다."""
+    return f"{normalize_query(region)}|{normalize_query(product)}"
+
+
+class KnowledgeBase:
+    """미리 수집해 둔 원산지/상품별 웹 리서치 스니펫 모음
+
+    precompute_knowledge.py로 만들며, gzip으로 압축한 JSON 파일 하나에 저장됩니다.
+    파일에는 형식 버전(`format_version`)과 빌드할 때마다 1씩 오르는 `revision`이 기록됩니다.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, Dict[str, Any]]] = None, revision: int = 0,
+                 built_at: Optional[float] = None):
+        self.entries = entries or {}
+        self.revision = revision
+        self.built_at = built_at
+
+    @classmethod
+    def load(cls, path: str) -> "KnowledgeBase":
+        """파일에서 지식 베이스를 읽습니다. 형식 버전이 다르면 ValueError를 발생시킵니다."""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 지식 베이스 형식 버전입니다: {data.get('format_version')}")
+        return cls(data.get("entries", {}), data.get("revision", 0), data.get("built_at"))
+
+    def save(self, path: str) -> None:
+        """revision을 올리고 파일에 저장합니다. 쓰는 도중 종료되어도 기존 파일이 깨지지 않도록 임시 파일을 교체합니다."""
+        self.revision += 1
+        self.built_at = time.time()
+        data = {
+            "format_version": FORMAT_VERSION,
+            "revision": self.revision,
+            "built_at": self.built_at,
+            "entries": self.entries,
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=9) as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def lookup(self, region: str, product: str) -> Optional[Dict[str, Any]]:
+        """(원산지, 상품)의 항목을 반환합니다. 없으면 None을 반환합니다."""
+        return self.entries.get(make_key(region, product))
+
+    def put(self, region: str, product: str, snippets: List[Dict[str, Any]], queries: List[str]) -> None:
+        self.entries[make_key(region, product)] = {
+            "region": region,
+            "product": product,
+            "queries": queries,
+            "snippets": snippets,
+            "collected_at": time.time(),
+        }
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, pair) -> bool:
+        region, product = pair
+        return make_key(region, product) in self.entries
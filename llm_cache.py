@@ -0,0 +1,106 @@
+import contextvars
+import hashlib
+import json
+import logging
+import threading
+import warnings
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Sequence, Iterator
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import Generation
+
+from sqlite_store import SQLiteTTLStore
+from text_normalize import normalize_text
+
+# langchain_core.load.loads의 beta 경고는 캐시를 읽을 때마다 출력되므로 표시하지 않음
+warnings.filterwarnings("ignore", message="The function `loads` is in beta")
+
+# 현재 호출에서 캐시 조회를 건너뛸지 여부 ("다시 생성" 버튼 등)
+_bypass_lookup: contextvars.ContextVar[bool] = contextvars.ContextVar("llm_cache_bypass", default=False)
+
+
+def _normalize_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return normalize_text(value)
+    if isinstance(value, list):
+        return [_normalize_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _normalize_value(item) for key, item in value.items()}
+    return value
+
+
+def normalize_prompt(prompt: str) -> str:
+    """캐시 키로 사용할 수 있도록 프롬프트를 정규화합니다 (유니코드 NFC, 공백 정리).
+
+    채팅 모델의 프롬프트는 메시지 목록을 직렬화한 JSON이므로, 가능하면 JSON 안의 문자열 값을 각각 정규화합니다.
+    """
+    try:
+        parsed = json.loads(prompt)
+    except (TypeError, ValueError):
+        return normalize_text(prompt)
+    return json.dumps(_normalize_value(parsed), sort_keys=True, ensure_ascii=False)
+
+
+@contextmanager
+def bypass_cache(active: bool = True) -> Iterator[None]:
+    """블록 안의 LLM 호출은 캐시를 조회하지 않고 항상 새로 생성합니다. 새 결과는 캐시에 다시 저장됩니다."""
+    token = _bypass_lookup.set(active)
+    try:
+        yield
+    finally:
+        _bypass_lookup.reset(token)
+
+
+class LLMCache(BaseCache):
+    """LLM 응답을 SQLite 파일에 저장하는 LangChain 호환 캐시 (`ChatOpenAI(cache=...)`로 연결)
+
+    - 키: 정규화된 프롬프트 + 모델 설정(모델명, temperature, 응답 형식 등)의 SHA-256 해시
+    - 만료: 저장 후 `ttl_seconds`가 지나면 미스로 처리하고 삭제
+    - 용량: 항목 수가 `max_entries`를 넘으면 가장 오래 사용되지 않은 항목부터 삭제 (LRU)
+    - 우회: `bypass_cache()` 블록 안에서는 조회를 건너뛰고 새로 생성한 결과로 갱신
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = 24 * 3600, max_entries: int = 2000):
+        self.bypassed = 0
+        self._lock = threading.Lock()
+        self._store = SQLiteTTLStore(db_path, "llm_cache", "generations", ttl_seconds, max_entries,
+                                     label="LLM 캐시")
+
+    @staticmethod
+    def make_key(prompt: str, llm_string: str) -> str:
+        """정규화된 프롬프트와 모델 설정으로 캐시 키를 만듭니다."""
+        payload = f"{normalize_prompt(prompt)}\x00{llm_string}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        """캐시된 응답을 반환합니다. 없거나 만료되었거나 우회 중이면 None을 반환합니다."""
+        if _bypass_lookup.get():
+            with self._lock:
+                self.bypassed += 1
+            return None
+
+        generations = self._store.get(self.make_key(prompt, llm_string))
+        if generations is None:
+            return None
+        try:
+            return [loads(item, allowed_objects="core") for item in json.loads(generations)]
+        except Exception as e:
+            logging.warning(f"LLM 캐시 항목을 읽을 수 없어 무시합니다: {e}")
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        """LLM 응답을 저장하고, 최대 항목 수를 넘으면 오래된 항목을 정리합니다."""
+        payload = json.dumps([dumps(generation) for generation in return_val], ensure_ascii=False)
+        self._store.set(self.make_key(prompt, llm_string), payload)
+
+    def clear(self, **kwargs: Any) -> None:
+        """모든 캐시 항목과 통계를 초기화합니다."""
+        self._store.clear()
+        with self._lock:
+            self.bypassed = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 크기 산정을 위한 히트/미스 통계를 반환합니다."""
+        return {**self._store.stats(), "bypassed": self.bypassed}
@@ -0,0 +1,74 @@
+import hashlib
+import os
+from collections import Counter
+from typing import Any, Callable, Dict, List, Sequence
+
+from text_normalize import compact_text
+
+# SimHash 지문 비트 수와 shingle(문자 n-gram) 길이
+SIMHASH_BITS = 64
+SHINGLE_SIZE = int(os.getenv("NEAR_DUP_SHINGLE_SIZE", "3"))
+# 두 지문의 해밍 거리가 이 값 이하이면 거의 같은 내용으로 봄 (0이면 사실상 완전히 같은 문서만)
+NEAR_DUP_MAX_DISTANCE = int(os.getenv("NEAR_DUP_MAX_DISTANCE", "12"))
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Counter:
+    """정규화한 텍스트의 문자 n-gram 빈도를 반환합니다."""
+    # 공백/문장부호 차이는 무시하고 글자만 비교
+    compact = compact_text(text)
+    if len(compact) <= size:
+        return Counter([compact]) if compact else Counter()
+    return Counter(compact[i:i + size] for i in range(len(compact) - size + 1))
+
+
+def _shingle_hash(shingle: str) -> int:
+    # 프로세스마다 값이 바뀌는 내장 hash() 대신 고정된 해시를 사용
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def simhash(text: str, size: int = SHINGLE_SIZE) -> int:
+    """텍스트의 64비트 SimHash 지문을 반환합니다. 내용이 비슷할수록 지문의 해밍 거리가 가깝습니다."""
+    import numpy as np
+
+    counts = shingles(text, size)
+    if not counts:
+        return 0
+    hashes = np.fromiter((_shingle_hash(s) for s in counts), dtype="<u8", count=len(counts))
+    weights = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    # 각 shingle 해시의 비트를 ±가중치로 더한 뒤, 합이 양수인 비트를 1로 설정
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    totals = weights @ (bits.astype(np.int64) * 2 - 1)
+    return int(np.packbits(totals > 0, bitorder="little").view("<u8")[0])
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def cluster_near_duplicates(texts: Sequence[str], scores: Sequence[float],
+                            max_distance: int = NEAR_DUP_MAX_DISTANCE) -> List[List[int]]:
+    """거의 같은 텍스트끼리 묶은 클러스터(인덱스 목록)들을 반환합니다.
+
+    점수가 높은 텍스트부터 차례로 기존 클러스터의 대표와 비교하므로, 각 클러스터의 첫 번째 인덱스가
+    그 클러스터에서 점수가 가장 높은 텍스트입니다. 클러스터는 대표의 원래 순서대로 정렬됩니다.
+    """
+    fingerprints = [simhash(text) for text in texts]
+    order = sorted(range(len(texts)), key=lambda i: scores[i], reverse=True)
+    clusters: List[List[int]] = []
+    for index in order:
+        for cluster in clusters:
+            if hamming_distance(fingerprints[index], fingerprints[cluster[0]]) <= max_distance:
+                cluster.append(index)
+                break
+        else:
+            clusters.append([index])
+    return sorted(clusters, key=lambda cluster: cluster[0])
+
+
+def dedupe_near_duplicates(items: List[Dict[str, Any]], score: Callable[[Dict[str, Any]], float],
+                           text_key: str = "content",
+                           max_distance: int = NEAR_DUP_MAX_DISTANCE) -> List[Dict[str, Any]]:
+    """거의 같은 내용의 항목들 중 `score`가 가장 높은 항목만 남깁니다. 남은 항목은 원래 순서를 유지합니다."""
+    clusters = cluster_near_duplicates([item.get(text_key, "") for item in items],
+                                       [score(item) for item in items], max_distance)
+    return [items[cluster[0]] for cluster in clusters]
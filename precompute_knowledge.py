@@ -0,0 +1,97 @@
+"""원산지/상품별 리서치 지식 베이스를 미리 만드는 스크립트
+
+입력 파일(CSV)의 각 줄은 `원산지,상품명` 쌍입니다. 첫 줄이 `원산지,상품명` 헤더이면 건너뜁니다.
+    경북 영천,사과
+    충북 충주,복숭아
+
+각 쌍에 대해 앱의 리서치 단계와 같은 다섯 가지 쿼리로 웹을 검색하고, 중복을 제거한 스니펫을
+gzip으로 압축한 지식 베이스 파일(기본값: api_function.KNOWLEDGE_BASE_PATH)에 저장합니다.
+앱은 이 파일에 있는 원산지/상품이면 웹 검색 없이 바로 스니펫을 사용합니다.
+이미 파일에 있는 쌍은 건너뛰며, `--refresh`를 주면 다시 수집합니다.
+
+사용법:
+    python precompute_knowledge.py pairs.csv --workers 3
+"""
+import argparse
+import asyncio
+import csv
+import logging
+import os
+import sys
+import time
+from typing import List, Tuple
+
+import api_function as api
+from knowledge_base import KnowledgeBase
+
+HEADER = ("원산지", "상품명")
+
+
+def load_pairs(path: str) -> List[Tuple[str, str]]:
+    """CSV 파일에서 (원산지, 상품명) 목록을 읽습니다. 잘못된 줄과 중복된 쌍은 건너뜁니다."""
+    pairs, seen = [], set()
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for line_number, row in enumerate(csv.reader(f), start=1):
+            row = [cell.strip() for cell in row]
+            if not any(row) or (line_number == 1 and tuple(row[:2]) == HEADER):
+                continue
+            if len(row) < 2 or not row[0] or not row[1]:
+                logging.warning(f"{line_number}번째 줄에 원산지와 상품명이 모두 있어야 합니다: {row}")
+                continue
+            if (row[0], row[1]) not in seen:
+                seen.add((row[0], row[1]))
+                pairs.append((row[0], row[1]))
+    return pairs
+
+
+async def collect_all(pairs: List[Tuple[str, str]], knowledge_base: KnowledgeBase, workers: int,
+                      retrieval_mode: str) -> List[Tuple[str, str]]:
+    """모든 쌍의 스니펫을 수집해 지식 베이스에 넣고, 수집에 실패한 쌍 목록을 반환합니다."""
+    semaphore = asyncio.Semaphore(max(1, workers))
+    failed = []
+
+    async def _collect(region: str, product: str) -> None:
+        async with semaphore:
+            snippets, queries = await api.acollect_research_snippets(
+                {"원산지": region, "상품명": product}, retrieval_mode=retrieval_mode)
+        if snippets:
+            knowledge_base.put(region, product, snippets, queries)
+            logging.info(f"[{region} {product}] 스니펫 {len(snippets)}개 수집")
+        else:
+            failed.append((region, product))
+            logging.warning(f"[{region} {product}] 스니펫을 수집하지 못했습니다.")
+
+    await asyncio.gather(*(_collect(region, product) for region, product in pairs))
+    return failed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="원산지/상품별 리서치 지식 베이스를 미리 만듭니다.")
+    parser.add_argument("input", help="원산지,상품명 CSV 파일")
+    parser.add_argument("--output", default=api.KNOWLEDGE_BASE_PATH, help="지식 베이스 파일 경로 (.json.gz)")
+    parser.add_argument("--workers", type=int, default=2, help="동시에 수집할 원산지/상품 쌍 수")
+    parser.add_argument("--refresh", action="store_true", help="이미 있는 쌍도 다시 수집")
+    parser.add_argument("--retrieval-mode", default="web", choices=("web", "index_first"),
+                        help="스니펫 수집 방식 (기본값: 항상 웹 검색)")
+    args = parser.parse_args()
+
+    knowledge_base = KnowledgeBase.load(args.output) if os.path.exists(args.output) else KnowledgeBase()
+    pairs = load_pairs(args.input)
+    pending = pairs if args.refresh else [pair for pair in pairs if pair not in knowledge_base]
+    print(f"총 {len(pairs)}개 쌍 중 {len(pending)}개를 수집합니다. (기존 항목 {len(knowledge_base)}개)")
+
+    start = time.perf_counter()
+    failed = asyncio.run(collect_all(pending, knowledge_base, args.workers, args.retrieval_mode))
+    elapsed = time.perf_counter() - start
+    api.wait_for_background_tasks()  # 수집한 스니펫의 벡터 인덱스 추가가 끝날 때까지 대기
+
+    knowledge_base.save(args.output)
+    print(f"저장 완료: {args.output} (revision {knowledge_base.revision}, 항목 {len(knowledge_base)}개, "
+          f"{os.path.getsize(args.output) / 1024:.1f}KB, {elapsed:.1f}초)")
+    if failed:
+        print(f"수집에 실패한 쌍: {', '.join(f'{r} {p}' for r, p in failed)} (다시 실행하면 이 쌍만 재시도합니다)")
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
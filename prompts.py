@@ -1,7 +1,11 @@
+from functools import lru_cache
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict
 
-from langchain_core.prompts import PromptTemplate
+# 프롬프트 이름 -> 템플릿 문자열
+# langchain_core는 import 비용이 크므로, PromptTemplate 객체는 처음 사용할 때 만듭니다. (get_prompt 참고)
+# `prompts.BRANDING_PROMPT`처럼 모듈 속성으로 접근해도 같은 객체를 반환합니다.
+_PROMPT_TEMPLATES: Dict[str, str] = {}
 
 # --- Pydantic Output Schemas ---
 
@@ -50,10 +54,10 @@ class SloganAlternatives(BaseModel):
     alternatives: List[str] = Field(description="기존 슬로건과 다른 새로운 스타일의 슬로건 3개 리스트")
 
 # --- Chatbot & Branding Prompts ---
-EXTRACT_INFO_PROMPT = PromptTemplate.from_template("...") # 생략
+_PROMPT_TEMPLATES["EXTRACT_INFO_PROMPT"] = ("...") # 생략
 
 # --- 🔽 [신규] 상품명 핵심 단어 추출을 위한 프롬프트 🔽 ---
-EXTRACT_CORE_KEYWORD_PROMPT = PromptTemplate.from_template(
+_PROMPT_TEMPLATES["EXTRACT_CORE_KEYWORD_PROMPT"] = (
     """
     당신은 주어진 상품명에서 핵심적인 상품 분류 단어를 추출하는 전문가입니다.
     예를 들어, '햇살담은 영천 별빛 사과'라는 상품명이 주어지면, 이 상품의 핵심은 '사과'입니다.
@@ -69,7 +73,7 @@ EXTRACT_CORE_KEYWORD_PROMPT = PromptTemplate.from_template(
 # --- Chatbot & Branding Prompts ---
 
 # 1. 챗봇 정보 추출용 프롬프트 템플릿
-EXTRACT_INFO_PROMPT = PromptTemplate.from_template(
+_PROMPT_TEMPLATES["EXTRACT_INFO_PROMPT"] = (
     """
     당신은 사용자로부터 상품 브랜딩에 필요한 정보를 추출하는 AI 어시스턴트입니다.
     사용자의 최근 발화와 이전 대화 내용을 기반으로 다음 정보들을 추출하고 JSON 형태로 반환하세요.
@@ -85,7 +89,7 @@ EXTRACT_INFO_PROMPT = PromptTemplate.from_template(
 )
 
 # 2. 브랜딩 생성용 프롬프트 템플릿
-BRANDING_PROMPT = PromptTemplate.from_template(
+_PROMPT_TEMPLATES["BRANDING_PROMPT"] = (
     """
     ## [페르소나]
     당신은 대한민국 최고의 로컬 브랜딩 전략가, '장동민'입니다. 당신의 철학은 '모든 위대한 브랜드는 하나의 강력한 컨셉에서출발한다'는 것입니다.
@@ -135,7 +139,7 @@ BRANDING_PROMPT = PromptTemplate.from_template(
 # --- Detail Page & Marketing Prompts ---
 
 # 3. 상세페이지 텍스트 생성용 프롬프트 템플릿
-SECTION_TEXT_DEFAULT_PROMPT = PromptTemplate.from_template(
+_PROMPT_TEMPLATES["SECTION_TEXT_DEFAULT_PROMPT"] = (
     """
     다음 정보를 바탕으로, 쇼핑몰 상세페이지 이미지 섹션 #{section_number}에 삽입될 텍스트를 생성해줘.
     - 섹션 컨텍스트: {main_context} / 서브: {sub_context}
@@ -154,7 +158,7 @@ DETAIL_PAGE_SECTION_CONTEXTS = [
 
 
 # 4. 마케팅 텍스트 생성용 프롬프트 템플릿
-MARKETING_TEXT_PROMPT = PromptTemplate.from_template(
+_PROMPT_TEMPLATES["MARKETING_TEXT_PROMPT"] = (
     """
     당신은 {platform} 마케팅 전문가입니다. 다음 브랜딩 정보를 활용하여 {platform}에 맞는 마케팅 게시물을 JSON 형식(title, text 필드 포함)으로 작성해주세요.
     브랜딩 정보: {branding_info}, 상품 정보: {product_info}
@@ -164,7 +168,7 @@ MARKETING_TEXT_PROMPT = PromptTemplate.from_template(
 # --- DALL-E Image Generation Prompts & Configs ---
 
 # 5. DALL-E 이미지 생성을 위한 프레임 템플릿
-DALLE_BASE_WITH_MARGINS = PromptTemplate.from_template(
+_PROMPT_TEMPLATES["DALLE_BASE_WITH_MARGINS"] = (
     """
     ### 최종 이미지 구성 목표
     '1024x1792' 사이즈의 긴 흰색 캔버스 중앙에 '1024x1024' 사이즈의 정사각형 사진이 배치된 구성.
@@ -186,7 +190,7 @@ DALLE_BASE_WITH_MARGINS = PromptTemplate.from_template(
     """
 )
 
-DALLE_BASE_FULL_FRAME = PromptTemplate.from_template(
+_PROMPT_TEMPLATES["DALLE_BASE_FULL_FRAME"] = (
     """
     ### 최종 이미지 구성 목표
     '1024x1792' 사이즈의 세로 전체 화면을 사용하는 하나의 완성된 이미지.
@@ -202,12 +206,13 @@ DALLE_BASE_FULL_FRAME = PromptTemplate.from_template(
 )
 
 # True는 'WITH_MARGINS', False는 'FULL_FRAME'을 의미
-DETAIL_PAGE_IMAGE_FRAMES = [
-    DALLE_BASE_WITH_MARGINS,    # 1. 메인
-    DALLE_BASE_WITH_MARGINS,    # 2. 스토리
-    DALLE_BASE_FULL_FRAME,      # 3. 특징 (인포그래픽 스타일)
-    DALLE_BASE_WITH_MARGINS,    # 4. 레시피
-    DALLE_BASE_WITH_MARGINS,    # 5. 아웃트로
+# (프롬프트 이름 목록이며, DETAIL_PAGE_IMAGE_FRAMES로 접근하면 PromptTemplate 목록을 반환)
+DETAIL_PAGE_IMAGE_FRAME_NAMES = [
+    "DALLE_BASE_WITH_MARGINS",  # 1. 메인
+    "DALLE_BASE_WITH_MARGINS",  # 2. 스토리
+    "DALLE_BASE_FULL_FRAME",    # 3. 특징 (인포그래픽 스타일)
+    "DALLE_BASE_WITH_MARGINS",  # 4. 레시피
+    "DALLE_BASE_WITH_MARGINS",  # 5. 아웃트로
 ]
 
 # format 메소드를 사용하기 위해 product_name, origin을 변수로 남겨둠
@@ -224,7 +229,7 @@ DETAIL_PAGE_IMAGE_THEMES = [
     "A beautiful, artistic shot of the packaged {product_name} or a final, perfect representation of the product. The background is clean and slightly abstract, focusing all attention on the product's premium quality. It could have a single, gentle light source, creating a sophisticated and trustworthy mood. **The image must be purely visual and contain absolutely no text, letters, or words.**"
 ]
 
-GENERATE_PAGE_TEXTS_PROMPT = PromptTemplate.from_template(
+_PROMPT_TEMPLATES["GENERATE_PAGE_TEXTS_PROMPT"] = (
     """
     당신은 농수산물 전문 콘텐츠 마케터입니다. 주어진 정보를 바탕으로, 아래 6가지 텍스트 콘텐츠를 JSON 형식으로 생성해주세요.
 
@@ -246,7 +251,7 @@ GENERATE_PAGE_TEXTS_PROMPT = PromptTemplate.from_template(
     """
 )
 
-DALLE_PRODUCT_IMAGE_PROMPT = PromptTemplate.from_template(
+_PROMPT_TEMPLATES["DALLE_PRODUCT_IMAGE_PROMPT"] = (
     """
     A hyper-realistic, minimalist photograph showcasing the **true form** of a single, perfect '{product_name}' 
     from '{origin}'.
@@ -267,7 +272,7 @@ DALLE_PRODUCT_IMAGE_PROMPT = PromptTemplate.from_template(
 )
 
 # 4. 마케팅 텍스트 생성용 프롬프트 템플릿
-MARKETING_TEXT_PROMPT = PromptTemplate.from_template(
+_PROMPT_TEMPLATES["MARKETING_TEXT_PROMPT"] = (
     """
     당신은 {platform} 마케팅 전문가입니다. 다음 브랜딩 정보를 활용하여 {platform}에 맞는 마케팅 게시물을 JSON 형식(title, text 필드 포함)으로 작성해주세요.
     브랜딩 정보: {branding_info}, 상품 정보: {product_info}
@@ -284,7 +289,7 @@ STORY_INTERVIEW_QUESTIONS = [
 ]
 
 # AI 인터뷰 답변을 바탕으로 스토리를 종합하는 프롬프트
-STORY_GENERATION_FROM_INTERVIEW_PROMPT = PromptTemplate.from_template(
+_PROMPT_TEMPLATES["STORY_GENERATION_FROM_INTERVIEW_PROMPT"] = (
     """
     [페르소나(Persona)]
     당신은 지역 소상공인의 진심을 발견하여 소비자와 연결하는 '로컬 브랜딩 스토리텔러'입니다. 당신의 목표는 단순히 글을 쓰는 것이 아니라, 사장님의 투박한 답변 속에 숨겨진 땀과 철학, 그리고 지역의 특별한 가치를 발굴하여 한 편의 감동적인 이야기로 엮어내는 것입니다. 당신은 디지털 마케팅에 서툰 사장님의 든든한 파트너입니다.
@@ -337,7 +342,7 @@ STORY_GENERATION_FROM_INTERVIEW_PROMPT = PromptTemplate.from_template(
     """
 )
 
-INSTAGRAM_POST_PROMPT = PromptTemplate.from_template(
+_PROMPT_TEMPLATES["INSTAGRAM_POST_PROMPT"] = (
     """
     ## [Mission]
     You are a top-tier Instagram content marketing expert for local food brands.
@@ -365,7 +370,7 @@ INSTAGRAM_POST_PROMPT = PromptTemplate.from_template(
     """
 )
 
-NAVER_BLOG_PROMPT = PromptTemplate.from_template(
+_PROMPT_TEMPLATES["NAVER_BLOG_PROMPT"] = (
     """
     ## [Mission]
     You are a professional content marketer who creates highly informative and SEO-optimized blog posts for the Naver platform. Your mission is to write a detailed, engaging informational blog post from an expert's perspective, as if you were the brand owner.
@@ -392,7 +397,7 @@ NAVER_BLOG_PROMPT = PromptTemplate.from_template(
     """
 )
 
-REGENERATE_SLOGAN_PROMPT = PromptTemplate.from_template(
+_PROMPT_TEMPLATES["REGENERATE_SLOGAN_PROMPT"] = (
     """
     당신은 아주 창의적인 카피라이터입니다.
     아래의 '핵심 컨셉'을 바탕으로, '기존 슬로건'과는 다른 느낌의 새로운 슬로건 3개를 제안해주세요.
@@ -405,3 +410,17 @@ REGENERATE_SLOGAN_PROMPT = PromptTemplate.from_template(
     """
 )
 
+
+@lru_cache(maxsize=None)
+def get_prompt(name: str):
+    """이름에 해당하는 PromptTemplate을 반환합니다. 처음 호출할 때 langchain_core를 import해 만듭니다."""
+    from langchain_core.prompts import PromptTemplate
+    return PromptTemplate.from_template(_PROMPT_TEMPLATES[name])
+
+
+def __getattr__(name: str):
+    if name in _PROMPT_TEMPLATES:
+        return get_prompt(name)
+    if name == "DETAIL_PAGE_IMAGE_FRAMES":
+        return [get_prompt(frame) for frame in DETAIL_PAGE_IMAGE_FRAME_NAMES]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,46 @@
+import json
+from typing import Optional, Dict, Any
+
+from sqlite_store import SQLiteTTLStore
+from text_normalize import normalize_text
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키로 사용할 수 있도록 쿼리를 정규화합니다 (유니코드 NFC, 공백 정리, 소문자화)."""
+    return normalize_text(query, lowercase=True)
+
+
+class ResearchCache:
+    """Tavily 검색 결과를 SQLite 파일에 저장하는 디스크 캐시
+
+    - 키: 정규화된 쿼리 + 검색 옵션
+    - 만료: 저장 후 `ttl_seconds`가 지나면 미스로 처리하고 삭제
+    - 용량: 항목 수가 `max_entries`를 넘으면 가장 오래 사용되지 않은 항목부터 삭제 (LRU)
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 5000):
+        self._store = SQLiteTTLStore(db_path, "research_cache", "response", ttl_seconds, max_entries,
+                                     label="리서치 캐시")
+
+    @staticmethod
+    def make_key(query: str, **search_options) -> str:
+        """정규화된 쿼리와 검색 옵션으로 캐시 키를 만듭니다."""
+        options = json.dumps(search_options, sort_keys=True, ensure_ascii=False)
+        return f"{normalize_query(query)}|{options}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시된 검색 응답을 반환합니다. 없거나 만료되었으면 None을 반환합니다."""
+        response = self._store.get(key)
+        return json.loads(response) if response is not None else None
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        """검색 응답을 저장하고, 최대 항목 수를 넘으면 오래된 항목을 정리합니다."""
+        self._store.set(key, json.dumps(response, ensure_ascii=False))
+
+    def clear(self) -> None:
+        """모든 캐시 항목과 통계를 초기화합니다."""
+        self._store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 크기 산정을 위한 히트/미스 통계를 반환합니다."""
+        return self._store.stats()
@@ -0,0 +1,113 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Dict, Any
+
+
+class SQLiteTTLStore:
+    """만료 시간(TTL)과 최대 항목 수(LRU)를 지원하는 SQLite 키-값 저장소
+
+    ResearchCache, LLMCache 등 디스크 캐시들이 공통으로 사용합니다. 값은 문자열로 저장하며,
+    직렬화는 각 캐시가 담당합니다.
+
+    - 만료: 저장 후 `ttl_seconds`가 지나면 미스로 처리하고 삭제
+    - 용량: 항목 수가 `max_entries`를 넘으면 가장 오래 사용되지 않은 항목부터 삭제 (LRU)
+    - 여러 스레드에서 함께 사용하므로 하나의 연결을 잠금으로 보호합니다.
+    """
+
+    def __init__(self, db_path: str, table: str, value_column: str, ttl_seconds: float, max_entries: int,
+                 label: str = "캐시"):
+        self.db_path = db_path
+        self.table = table
+        self.value_column = value_column
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.label = label
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT PRIMARY KEY,
+                {value_column} TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_access ON {table} (last_access)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """저장된 값을 반환합니다. 없거나 만료되었으면 None을 반환합니다."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self.value_column}, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute(f"UPDATE {self.table} SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """값을 저장하고, 최대 항목 수를 넘으면 오래된 항목을 정리합니다."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, {self.value_column}, created_at, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self) -> None:
+        count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+            logging.info(f"{self.label} 용량 초과로 {overflow}개 항목을 정리했습니다.")
+
+    def clear(self) -> None:
+        """모든 항목과 통계를 초기화합니다."""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 크기 산정을 위한 히트/미스 통계를 반환합니다."""
+        with self._lock:
+            entries = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries,
+        }
@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api_function as api  # noqa: E402
+from llm_cache import LLMCache  # noqa: E402
+
+# llm_cache가 모듈 import 시 등록하는 경고 필터는 pytest가 테스트마다 초기화하므로 여기서 다시 지정
+pytestmark = pytest.mark.filterwarnings("ignore:The function `loads` is in beta")
+
+
+def _clear_accessors():
+    for accessor in (api.get_llm, api.get_cached_llm, api.get_structured_chain):
+        accessor.cache_clear()
+
+
+@pytest.fixture
+def cached_keyword_llm(tmp_path, monkeypatch):
+    """LLM 캐시가 연결된 가짜 채팅 모델로 extract_core_product_keyword를 실행할 수 있게 합니다."""
+    cache = LLMCache(str(tmp_path / "llm_cache.sqlite3"))
+    responses = ['{"core_keyword": "사과", "modifiers": "영천"}', '{"core_keyword": "배", "modifiers": ""}']
+    monkeypatch.setattr(api, "get_llm_cache", lambda: cache)
+    monkeypatch.setattr(api, "_create_chat_llm", lambda cache=None: FakeListChatModel(responses=responses, cache=cache))
+    _clear_accessors()
+    yield cache
+    _clear_accessors()
+
+
+def test_product_name_spacing_variants_share_cache_entry(cached_keyword_llm):
+    assert api.extract_core_product_keyword("영천 사과") == "사과"
+    assert api.extract_core_product_keyword("영천사과") == "사과"
+    assert api.extract_core_product_keyword(" 영천  사과! ") == "사과"
+
+    stats = cached_keyword_llm.stats()
+    assert stats["entries"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_use_cache_false_bypasses_lookup(cached_keyword_llm):
+    assert api.extract_core_product_keyword("영천 사과") == "사과"
+    # 캐시를 건너뛰면 가짜 모델의 다음 응답이 나옴
+    assert api.extract_core_product_keyword("영천 사과", use_cache=False) == "배"
+    assert cached_keyword_llm.stats()["bypassed"] == 1
@@ -0,0 +1,95 @@
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import List, Tuple
+
+# 폰트별로 기억할 최대 측정 결과 수 (오래 사용하지 않은 텍스트부터 지움)
+TEXT_WIDTH_CACHE_SIZE = int(os.getenv("TEXT_WIDTH_CACHE_SIZE", "4096"))
+
+# 폰트 객체별 측정 결과 캐시 (폰트가 사라지면 캐시도 함께 정리됨)
+_width_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_height_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_cache_lock = threading.Lock()
+
+# 줄 높이 측정용 문자열 (한글, 대문자, 아래로 내려오는 글자를 모두 포함)
+_LINE_HEIGHT_SAMPLE = "가Ay"
+
+
+def measure(font, text: str) -> float:
+    """텍스트의 가로 길이를 반환합니다. 폰트별로 최근 측정한 TEXT_WIDTH_CACHE_SIZE개의 결과를 재사용합니다."""
+    with _cache_lock:
+        widths = _width_cache.get(font)
+        if widths is None:
+            widths = _width_cache[font] = OrderedDict()
+        width = widths.get(text)
+        if width is not None:
+            widths.move_to_end(text)
+            return width
+
+    width = font.getlength(text)
+    with _cache_lock:
+        widths[text] = width
+        if len(widths) > TEXT_WIDTH_CACHE_SIZE:
+            widths.popitem(last=False)
+    return width
+
+
+def line_height(font) -> int:
+    """폰트의 한 줄 높이를 반환합니다. 폰트마다 한 번만 측정합니다."""
+    height = _height_cache.get(font)
+    if height is None:
+        height = font.getbbox(_LINE_HEIGHT_SAMPLE)[3]
+        _height_cache[font] = height
+    return height
+
+
+def _break_long_word(word: str, font, max_width: float) -> List[Tuple[str, float]]:
+    """한 줄에 들어가지 않는 긴 단어(띄어쓰기 없는 한글 문장 등)를 글자 단위로 나눕니다."""
+    pieces = []
+    current, current_width = "", 0.0
+    for char in word:
+        char_width = measure(font, char)
+        if current and current_width + char_width >= max_width:
+            pieces.append((current, current_width))
+            current, current_width = "", 0.0
+        current += char
+        current_width += char_width
+    if current:
+        pieces.append((current, current_width))
+    return pieces
+
+
+def wrap_text(text: str, font, max_width: float) -> List[Tuple[str, float]]:
+    """텍스트를 `max_width`보다 좁은 줄들로 나누고, (줄 텍스트, 줄 너비) 목록을 반환합니다.
+
+    각 단어의 너비는 폰트별로 한 번만 측정하며, 줄 너비는 단어 너비와 공백 너비를 누적해 계산하므로
+    줄 길이에 대해 선형 시간에 동작합니다. 한 줄보다 긴 단어는 글자 단위로 줄바꿈합니다.
+    """
+    space_width = measure(font, " ")
+    lines: List[Tuple[str, float]] = []
+    current: List[str] = []
+    current_width = 0.0
+
+    for word in text.split():
+        word_width = measure(font, word)
+        if word_width >= max_width:
+            if current:
+                lines.append((" ".join(current), current_width))
+                current, current_width = [], 0.0
+            pieces = _break_long_word(word, font, max_width)
+            lines.extend(pieces[:-1])
+            current, current_width = [pieces[-1][0]], pieces[-1][1]
+            continue
+
+        candidate_width = current_width + space_width + word_width if current else word_width
+        if current and candidate_width >= max_width:
+            lines.append((" ".join(current), current_width))
+            current, current_width = [word], word_width
+        else:
+            current.append(word)
+            current_width = candidate_width
+
+    if current:
+        lines.append((" ".join(current), current_width))
+    return lines
@@ -0,0 +1,14 @@
+import re
+import unicodedata
+
+
+def normalize_text(text: str, lowercase: bool = False) -> str:
+    """유니코드 NFC 정규화 후 연속된 공백을 하나로 합치고 앞뒤 공백을 지웁니다. `lowercase=True`이면 소문자로 바꿉니다."""
+    text = unicodedata.normalize("NFC", text or "")
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.lower() if lowercase else text
+
+
+def compact_text(text: str) -> str:
+    """공백/문장부호를 모두 지우고 글자만 남깁니다. (한글은 띄어쓰기가 사이트마다 달라지는 경우가 많음)"""
+    return re.sub(r"[\W_]+", "", normalize_text(text, lowercase=True))
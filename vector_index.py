@@ -0,0 +1,178 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from text_normalize import compact_text
+
+
+class HashingEmbedder:
+    """문자 n-gram을 해시해 고정 차원 벡터로 만드는 결정적(deterministic) 임베더
+
+    네트워크 없이 항상 같은 벡터를 만들므로 오프라인 테스트와 API 키가 없는 환경에서 사용합니다.
+    의미 유사도는 실제 임베딩 모델보다 약하며, 글자가 많이 겹치는 문장끼리 가깝게 나옵니다.
+    """
+
+    def __init__(self, dim: int = 256, ngram: int = 2):
+        self.dim = dim
+        self.ngram = ngram
+        self.name = f"hashing-{dim}-{ngram}"
+        # 이 값 이상의 코사인 유사도를 관련된 결과로 봄
+        self.default_min_score = 0.2
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        compact = compact_text(text)
+        for i in range(max(1, len(compact) - self.ngram + 1)):
+            gram = compact[i:i + self.ngram]
+            if not gram:
+                continue
+            digest = int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "little")
+            # 해시 충돌이 한쪽으로 쌓이지 않도록 부호도 해시로 정함
+            vector[digest % self.dim] += 1.0 if (digest >> 63) & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        return np.stack([self._embed_one(text) for text in texts]) if texts else np.zeros((0, self.dim), np.float32)
+
+
+class OpenAIEmbedder:
+    """OpenAI 임베딩 API를 사용하는 임베더 (여러 문장을 한 번의 요청으로 임베딩)"""
+
+    def __init__(self, client, model: str = "text-embedding-3-small", dim: int = 1536):
+        self.client = client
+        self.model = model
+        self.dim = dim
+        self.name = f"openai-{model}"
+        self.default_min_score = 0.5
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), np.float32)
+        response = self.client.embeddings.create(model=self.model, input=list(texts))
+        vectors = np.array([item.embedding for item in response.data], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+
+class VectorIndex:
+    """웹 검색 스니펫을 저장하는 로컬 벡터 인덱스 (flat, 코사인 유사도)
+
+    - vectors.f32: float32 벡터를 행 단위로 이어 붙인 파일 (검색할 때 np.memmap으로 읽음)
+    - meta.jsonl: 벡터와 같은 순서의 스니펫 메타데이터 (내용, 제목, URL, 원래 쿼리, Tavily 점수 등)
+    - 추가는 두 파일 끝에 덧붙이기만 하므로, 스니펫 수천 개 규모에서는 다시 빌드할 필요가 없습니다.
+    - 같은 내용(content)의 스니펫은 한 번만 저장합니다.
+    """
+
+    def __init__(self, root_dir: str, embedder):
+        self.embedder = embedder
+        self.dim = embedder.dim
+        # 임베더마다 벡터 공간이 다르므로 폴더를 나눔
+        self.root_dir = os.path.join(root_dir, embedder.name)
+        self.vectors_path = os.path.join(self.root_dir, "vectors.f32")
+        self.meta_path = os.path.join(self.root_dir, "meta.jsonl")
+        self._lock = threading.Lock()
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._meta: List[Dict[str, Any]] = self._load_meta()
+        self._content_keys = {self._content_key(m["content"]) for m in self._meta}
+        self._repair()
+
+    @staticmethod
+    def _content_key(content: str) -> str:
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    def _load_meta(self) -> List[Dict[str, Any]]:
+        meta = []
+        if not os.path.exists(self.meta_path):
+            return meta
+        with open(self.meta_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    meta.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break  # 중간에 끊긴 마지막 줄
+        return meta
+
+    def _repair(self) -> None:
+        # 저장 도중 종료되어 벡터와 메타데이터 개수가 다르면 짧은 쪽에 맞춤
+        row_bytes = self.dim * 4
+        vector_rows = os.path.getsize(self.vectors_path) // row_bytes if os.path.exists(self.vectors_path) else 0
+        rows = min(vector_rows, len(self._meta))
+        if vector_rows != rows or (os.path.exists(self.vectors_path) and os.path.getsize(self.vectors_path) != rows * row_bytes):
+            with open(self.vectors_path, "r+b") as f:
+                f.truncate(rows * row_bytes)
+        if len(self._meta) != rows:
+            self._meta = self._meta[:rows]
+            with open(self.meta_path, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(m, ensure_ascii=False) + "\n" for m in self._meta)
+            self._content_keys = {self._content_key(m["content"]) for m in self._meta}
+            logging.warning(f"벡터 인덱스가 불완전하게 저장되어 {rows}개 항목으로 복구했습니다.")
+
+    def __len__(self) -> int:
+        return len(self._meta)
+
+    def add(self, snippets: Sequence[Dict[str, Any]]) -> int:
+        """새 스니펫들을 임베딩해 인덱스에 추가하고, 실제로 추가된 개수를 반환합니다."""
+        with self._lock:
+            new = []
+            for snippet in snippets:
+                content = snippet.get("content", "")
+                key = self._content_key(content)
+                if content and key not in self._content_keys:
+                    self._content_keys.add(key)
+                    new.append(snippet)
+        if not new:
+            return 0
+
+        try:
+            vectors = self.embedder.embed([f"{s.get('title', '')} {s['content']}" for s in new]).astype(np.float32)
+        except Exception:
+            # 임베딩에 실패한 스니펫은 다음에 다시 추가할 수 있도록 표시를 지움
+            with self._lock:
+                self._content_keys.difference_update(self._content_key(s["content"]) for s in new)
+            raise
+        now = time.time()
+        with self._lock:
+            # 벡터를 먼저 쓰고 메타데이터를 나중에 써서, 중간에 끊겨도 _repair로 맞출 수 있게 함
+            with open(self.vectors_path, "ab") as f:
+                f.write(vectors.tobytes())
+            with open(self.meta_path, "a", encoding="utf-8") as f:
+                for snippet in new:
+                    record = {key: snippet.get(key, "") for key in ("query", "title", "url", "content")}
+                    record["score"] = snippet.get("score") or 0.0
+                    record["added_at"] = now
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    self._meta.append(record)
+        return len(new)
+
+    def search(self, queries: Sequence[str], top_k: int = 3) -> List[List[Tuple[float, Dict[str, Any]]]]:
+        """쿼리마다 코사인 유사도가 높은 스니펫 `top_k`개를 (유사도, 메타데이터) 목록으로 반환합니다."""
+        with self._lock:
+            rows = len(self._meta)
+            meta = self._meta[:rows]
+        if rows == 0 or not queries:
+            return [[] for _ in queries]
+
+        query_vectors = self.embedder.embed(list(queries)).astype(np.float32)
+        vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+        similarities = query_vectors @ vectors.T
+        k = min(top_k, rows)
+        results = []
+        for row in similarities:
+            top = np.argpartition(-row, k - 1)[:k]
+            top = top[np.argsort(-row[top])]
+            results.append([(float(row[i]), meta[i]) for i in top])
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._meta),
+            "embedder": self.embedder.name,
+            "bytes": os.path.getsize(self.vectors_path) if os.path.exists(self.vectors_path) else 0,
+        }